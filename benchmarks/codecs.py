@@ -0,0 +1,41 @@
+# python -m benchmarks.codecs
+import json
+import timeit
+
+from resources.codecs import CODECS
+
+from .documents import guild_document
+
+def main():
+    documents = {
+        "small league": json.loads(json.dumps(guild_document(teams=12, seasons=1))),
+        "large league": json.loads(json.dumps(guild_document())),
+    }
+
+    for name, document in documents.items():
+        document.pop("_id")
+        print(f"{name}: {len(json.dumps(document)) / 1024:.0f} KiB as json")
+
+        for codec in CODECS.values():
+            if not codec.available():
+                print(f"  {codec.name:<8} not installed")
+                continue
+
+            codec = codec()
+
+            # one field per category, the same way guilds are stored in redis
+            encoded = {key: codec.encode(val) for key, val in document.items()}
+            size    = sum(len(x) for x in encoded.values())
+
+            number = 20
+            encode = min(timeit.repeat(lambda: {key: codec.encode(val) for key, val in document.items()}, number=number, repeat=5)) / number
+            decode = min(timeit.repeat(lambda: {key: codec.decode(val) for key, val in encoded.items()}, number=number, repeat=5)) / number
+
+            print(
+                f"  {codec.name:<8} {size / 1024:7.0f} KiB"
+                f"  encode {encode * 1000:7.3f} ms ({size / encode / 1024 ** 2:6.0f} MiB/s)"
+                f"  decode {decode * 1000:7.3f} ms ({size / decode / 1024 ** 2:6.0f} MiB/s)"
+            )
+
+if __name__ == "__main__":
+    main()
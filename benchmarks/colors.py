@@ -0,0 +1,67 @@
+# python -m benchmarks.colors
+import io
+import random
+import timeit
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from resources.colors import dominant_color
+
+try:
+    from colorthief import ColorThief
+except ImportError:
+    ColorThief = None
+
+def encode(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+def logo(size: int, rng: random.Random) -> bytes:
+    # a flat team logo on a transparent background
+    image = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    draw  = ImageDraw.Draw(image)
+    draw.ellipse((size // 8, size // 8, size * 7 // 8, size * 7 // 8), fill=tuple(rng.randrange(256) for _ in range(3)) + (255,))
+    draw.rectangle((size // 3, size // 3, size * 2 // 3, size * 2 // 3), fill=tuple(rng.randrange(256) for _ in range(3)) + (255,))
+    return encode(image)
+
+def gradient(size: int, rng: random.Random) -> bytes:
+    start, end = np.array([rng.randrange(256) for _ in range(3)]), np.array([rng.randrange(256) for _ in range(3)])
+    steps = np.linspace(0, 1, size)[:, None]
+    row   = (start + (end - start) * steps).astype(np.uint8)
+    return encode(Image.fromarray(np.repeat(row[None, :, :], size, axis=0), "RGB"))
+
+def photo(size: int, rng: random.Random) -> bytes:
+    noise = np.random.default_rng(rng.randrange(2 ** 32)).integers(0, 256, (size, size, 3), dtype=np.uint8)
+    return encode(Image.fromarray(noise, "RGB"))
+
+def main():
+    rng = random.Random(0)
+    corpus = {
+        f"{kind.__name__} {size}px": [kind(size, rng) for _ in range(10)]
+        for size in [64, 512]
+        for kind in [logo, gradient, photo]
+    }
+
+    for name, icons in corpus.items():
+        number = 3
+        numpy  = min(timeit.repeat(lambda: [dominant_color(x) for x in icons], number=number, repeat=5)) / number / len(icons)
+
+        if ColorThief is None:
+            print(f"{name:<14} numpy {numpy * 1000:7.3f} ms  colorthief not installed")
+            continue
+
+        # colorthief is slow enough on big icons that one run is plenty
+        thief    = timeit.timeit(lambda: [ColorThief(io.BytesIO(x)).get_color(quality=1) for x in icons], number=1) / len(icons)
+        distance = np.mean([
+            np.linalg.norm(np.subtract(dominant_color(x), ColorThief(io.BytesIO(x)).get_color(quality=1))) for x in icons
+        ])
+
+        print(
+            f"{name:<14} numpy {numpy * 1000:7.3f} ms  colorthief {thief * 1000:8.3f} ms"
+            f"  ({thief / numpy:5.1f}x)  mean rgb distance {distance:5.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
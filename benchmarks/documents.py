@@ -0,0 +1,55 @@
+import datetime
+import random
+
+from resources.models import SettingCategories as categories
+
+def snowflake() -> str:
+    return str(random.randint(10 ** 17, 10 ** 19))
+
+def isoformat(days: int) -> str:
+    return (datetime.datetime(2023, 8, 1, tzinfo=datetime.timezone.utc) + datetime.timedelta(days=days)).isoformat()
+
+def guild_document(teams: int=50, seasons: int=10) -> dict:
+    # a league that has been running for a while, shaped like what is stored in mongodb
+    random.seed(0)
+
+    team_ids = [snowflake() for _ in range(teams)]
+
+    return {
+        "_id": snowflake(),
+        "settings": {
+            "roster_cap": "20",
+            "roster_minimum": "10",
+            "mimimum_warning_delay": "2",
+            "demand_type": "amount",
+            "demand_amount": "3",
+            "demand_wait": "7",
+            "waitlist_type": "queue",
+        },
+        "channels": {value: snowflake() for _, value, _ in categories.channels},
+        "roles": {value: snowflake() for _, value, _ in categories.roles},
+        "store": {f"{value}_webhook": f"{snowflake()}:{'x' * 68}" for _, value, _ in categories.channels},
+        "notices": {value: True for _, value in categories.notices},
+        "status": {value: True for _, value in categories.status},
+        "waitlist": [snowflake() for _ in range(100)],
+        "blacklist": [snowflake() for _ in range(50)],
+        "statsheets": [
+            {key: {"url": "https://docs.google.com/spreadsheets/d/" + "x" * 44, "players": [snowflake() for _ in range(20)]}
+            for key in ["passer", "runner", "receiver", "corner", "defender", "kicker"]}
+            for _ in range(seasons)
+        ],
+        "teams": {
+            team_id: {
+                "emoji": snowflake(),
+                "division": random.choice(["east", "west"]),
+                "elo": str(random.randint(800, 1600)),
+                "opponents": random.sample(team_ids, 10),
+            } for team_id in team_ids
+        },
+        "coaches": {snowflake(): abbr for abbr in ["FO", "GM", "HC", "AC", "OC"]},
+        "season": {"week": "8"},
+        "awards": {
+            str(season): {award: snowflake() for award in ["mvp", "opoy", "dpoy", "roty", "coty"]}
+            for season in range(seasons)
+        },
+    }
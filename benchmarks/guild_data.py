@@ -0,0 +1,69 @@
+# python -m benchmarks.guild_data
+import datetime
+import json
+import timeit
+
+from resources.models import BaseData, DataArray, DataObject, GuildData
+
+from .documents import guild_document
+
+def eager(val):
+    # how every value used to be decoded when a guild was loaded
+    if isinstance(val, dict):
+        return {key: eager(x) for key, x in val.items()}
+    elif isinstance(val, list):
+        return [eager(x) for x in val]
+    elif isinstance(val, str):
+        try:
+            return datetime.datetime.fromisoformat(val)
+        except ValueError:
+            pass
+    return val
+
+def load(document: dict) -> GuildData:
+    data = dict(document)
+    _id  = data.pop("_id")
+
+    for key, val in data.items():
+        if isinstance(val, dict):
+            data[key] = GuildData.sections.get(key, DataObject)(val)
+        elif isinstance(val, list):
+            data[key] = DataArray(val)
+
+    return GuildData(_id=_id, **data)
+
+def walk(val):
+    if isinstance(val, DataObject):
+        for x in val.values():
+            walk(x)
+    elif isinstance(val, DataArray):
+        for x in val:
+            walk(x)
+
+def touch_everything(guild_data: GuildData):
+    for key in guild_data.__dataclass_fields__:
+        if isinstance(val := getattr(guild_data, key), BaseData):
+            walk(val)
+
+def main():
+    document = json.loads(json.dumps(guild_document()))
+    size     = len(json.dumps(document))
+
+    cases = {
+        "eager decode (old)": lambda: eager(document),
+        "construct": lambda: load(document),
+        "construct + operator check": lambda: load(document).roles.operator,
+        "construct + teams lookup": lambda: [x.emoji for x in load(document).teams.values()],
+        "construct + touch everything": lambda: touch_everything(load(document)),
+        "regular() untouched": lambda: load(document).awards.regular(),
+    }
+
+    print(f"guild document: {size / 1024:.0f} KiB")
+
+    for name, case in cases.items():
+        number = 20
+        best   = min(timeit.repeat(case, number=number, repeat=5)) / number
+        print(f"{name:<30} {best * 1000:8.3f} ms")
+
+if __name__ == "__main__":
+    main()
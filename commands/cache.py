@@ -0,0 +1,104 @@
+import colorlog
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from resources.models import Colors
+from resources.peerless import Peerless
+
+logger = colorlog.getLogger('peerless')
+
+async def owner_only(interaction: discord.Interaction[Peerless]):
+    return interaction.user.id in [interaction.client.owner_id, 1104883688279384156, 450136921327271946]
+
+def size(amount: int) -> str:
+    for unit in ["B", "KiB", "MiB"]:
+        if amount < 1024:
+            return f"{amount:.0f} {unit}"
+        amount /= 1024
+    
+    return f"{amount:.1f} GiB"
+
+@app_commands.guild_only()
+class Cache(commands.Cog):
+    def __init__(self, bot: Peerless):
+        self.bot: Peerless = bot
+    
+    async def cog_load(self):
+        for command in self.get_app_commands():
+            if command._guild_ids is None:
+                command._guild_ids = []
+            
+            if self.bot.testing:
+                command._guild_ids.append(1122559657899204719)
+            else:
+                command._guild_ids.append(1105641316433547304)
+    
+    @app_commands.command(name='cache', description='view the size of the cache by namespace')
+    @app_commands.check(owner_only)
+    async def cache_report(self, interaction: discord.Interaction[Peerless]):
+        await interaction.response.defer(ephemeral=True)
+        
+        database = interaction.client.database
+        report   = await database.cache_report()
+        stats    = database.cache.stats()
+        
+        justification = max([len(x) for x in report] or [0])
+        value = ""
+        
+        for namespace, namespace_stats in sorted(report.items()):
+            value += f"`{namespace.rjust(justification)}` | {namespace_stats['entries']} keys, {size(namespace_stats['bytes'])}\n"
+        
+        embed = discord.Embed(
+            title = "Cache",
+            description = value or "*the cache is empty*",
+            color = Colors.blank,
+            timestamp = discord.utils.utcnow()
+        )
+        embed.add_field(
+            name = "Local Cache",
+            value = f"- `hits:` {stats['hits']}\n- `misses:` {stats['misses']}\n- `coalesced loads:` {database.coalesced}"
+        )
+        
+        if (write_behind := database.write_behind) is not None:
+            writes = write_behind.stats()
+            embed.add_field(
+                name = "Write Behind",
+                value = (
+                    f"- `pending:` {writes['pending']}, oldest {writes['oldest']:.1f}s\n"
+                    f"- `flushes:` {writes['flushes']}\n- `coalesced:` {writes['coalesced']}\n- `failures:` {writes['failures']}\n"
+                    f"- `lag:` {writes['last_lag'] * 1000:.0f}ms last, {writes['max_lag'] * 1000:.0f}ms max"
+                )
+            )
+        
+        members = interaction.client.member_index.stats()
+        embed.add_field(
+            name = "Members",
+            value = (
+                f"- `league members:` {members['indexed']} in {members['guilds']} guilds\n"
+                f"- `cached:` {members['cached']}\n- `active:` {members['active']}"
+            )
+        )
+        
+        notices = interaction.client.notices.stats()
+        embed.add_field(
+            name = "Notices",
+            value = (
+                f"- `queued:` {notices['depth']} across {notices['queues']} webhooks\n"
+                f"- `delivered:` {notices['delivered']} in {notices['messages']} messages\n"
+                f"- `dropped:` {notices['dropped']}\n- `failed:` {notices['failed']}\n"
+                f"- `latency:` {notices['avg_latency'] * 1000:.0f}ms avg, {notices['max_latency'] * 1000:.0f}ms max"
+            )
+        )
+        
+        await interaction.followup.send(embed=embed)
+
+async def setup(bot: Peerless):
+    cog = Cache(bot)
+    
+    for command in cog.walk_app_commands():
+        if hasattr(command, "callback"):
+            setattr(command.callback, "__name__", f"{cog.qualified_name.lower()}_{command.callback.__name__}")
+            setattr(command, "guild_only", True)
+    
+    await bot.add_cog(cog)
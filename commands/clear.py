@@ -1,3 +1,4 @@
+import time
 from typing import Literal, Optional
 
 import colorlog
@@ -5,6 +6,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from resources.mongodb import NAMESPACES
 from resources.peerless import Peerless
 
 logger = colorlog.getLogger('peerless')
@@ -28,11 +30,27 @@ class Clear(commands.Cog):
                 command._guild_ids.append(1105641316433547304)
                 
     @app_commands.command(name='clear', description='clears the redis cache')
+    @app_commands.describe(
+        scope="what to clear from the cache", 
+        target="the guild ID, user ID, or namespace (guild, user, member) to clear"
+    )
     @app_commands.check(owner_only)
-    async def redis_cache(self, interaction: discord.Interaction[Peerless]):
+    async def redis_cache(self, interaction: discord.Interaction[Peerless], 
+                          scope : Literal['guild', 'user', 'namespace', 'everything'],
+                          target: Optional[str]=None
+                        ):
         await interaction.response.defer(ephemeral=True)
-        await interaction.client.database.redis.flushall(asynchronous=True)
-        await interaction.followup.send(content="<:success:1136341672918253698>")
+        
+        if scope in ['guild', 'user'] and not (target or "").isdigit():
+            return await interaction.followup.send(content=f"<:fail:1136341671857102868>**| You need to give a {scope} ID to clear**")
+        
+        if scope == 'namespace' and target not in NAMESPACES:
+            return await interaction.followup.send(content=f"<:fail:1136341671857102868>**| The namespace has to be one of:** `{', '.join(NAMESPACES)}`")
+        
+        start   = time.perf_counter()
+        dropped = await interaction.client.database.clear_cache(scope, target if scope != 'everything' else None)
+        
+        await interaction.followup.send(content=f"<:success:1136341672918253698>**| Dropped {dropped} keys in {(time.perf_counter() - start) * 1000:.0f}ms**")
         
 async def setup(bot: Peerless):
     cog = Clear(bot)
@@ -0,0 +1,20 @@
+import discord
+from discord.ext import commands
+
+from resources.peerless import Peerless
+
+class Lists(commands.Cog):
+    def __init__(self, bot: Peerless):
+        self.bot: Peerless = bot
+    
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        if before.name != after.name or before.color != after.color:
+            self.bot.lists.role_update(after)
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.bot.lists.forget(guild.id)
+
+async def setup(bot: Peerless):
+    await bot.add_cog(Lists(bot))
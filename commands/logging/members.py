@@ -0,0 +1,75 @@
+import asyncio
+from os import environ as env
+from typing import Optional
+
+import colorlog
+import discord
+from discord.ext import commands
+
+from resources.peerless import Peerless
+from resources.utils import Debouncer
+
+logger = colorlog.getLogger('peerless')
+MEMBER_SWEEP_DELAY  = float(env.get('MEMBER_SWEEP_DELAY', 5 * 60)) # seconds between sweeps of the member cache
+MEMBER_RELOAD_DELAY = float(env.get('MEMBER_RELOAD_DELAY', 5)) # seconds to wait for more league role changes before indexing a guild again
+
+class Members(commands.Cog):
+    def __init__(self, bot: Peerless):
+        self.bot: Peerless = bot
+        
+        # league roles that change together are indexed once
+        self.debouncer = Debouncer(MEMBER_RELOAD_DELAY, self.bot.member_index.load, "index the league members")
+        self.sweeper: Optional[asyncio.Task] = None
+    
+    async def cog_load(self):
+        self.sweeper = asyncio.create_task(self.sweep_later())
+    
+    async def cog_unload(self):
+        self.sweeper.cancel()
+        self.debouncer.cancel()
+    
+    async def sweep_later(self):
+        while True:
+            await asyncio.sleep(MEMBER_SWEEP_DELAY)
+            
+            try:
+                self.bot.member_index.sweep_all()
+            except Exception as e:
+                logger.error(f"Failed to sweep the member cache. ({e})")
+    
+    async def load(self, guild: discord.Guild):
+        try:
+            await self.bot.member_index.load(guild)
+        except Exception as e:
+            logger.error(f"Failed to index the league members of guild, {guild.id}. ({e})")
+    
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # one guild at a time, the gateway only sends so many members at once
+        for guild in self.bot.guilds:
+            if not self.bot.member_index.loaded(guild.id):
+                await self.load(guild)
+    
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        await self.load(guild)
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.bot.member_index.forget(guild.id)
+    
+    @commands.Cog.listener()
+    async def on_member_update(self, _: discord.Member, after: discord.Member):
+        self.bot.member_index.update(after)
+    
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        self.bot.member_index.remove(member)
+    
+    # settings that add or remove league roles ask for the guild to be indexed again
+    @commands.Cog.listener(name="on_league_roles_update")
+    async def league_roles_updated(self, guild: discord.Guild):
+        self.debouncer.schedule(guild)
+
+async def setup(bot: Peerless):
+    await bot.add_cog(Members(bot))
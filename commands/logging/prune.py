@@ -0,0 +1,78 @@
+from os import environ as env
+
+import colorlog
+import discord
+from discord.ext import commands
+
+from resources.peerless import Peerless
+from resources.utils import Debouncer
+
+logger = colorlog.getLogger('peerless')
+PRUNE_DELAY = float(env.get('PRUNE_DELAY', 5)) # seconds to wait for more deletions before pruning a guild
+
+class Prune(commands.Cog):
+    def __init__(self, bot: Peerless):
+        self.bot: Peerless = bot
+        
+        # deletions that come in together are pruned with one write
+        self.debouncer = Debouncer(PRUNE_DELAY, self.prune, "prune deleted roles, emojis & channels")
+    
+    async def cog_unload(self):
+        self.debouncer.cancel()
+    
+    async def prune(self, guild: discord.Guild):
+        # an outage empties the guild's cache, nothing was deleted
+        if guild.unavailable or self.bot.database is None:
+            return
+        
+        categories = ["teams", "coaches", "roles", "channels", "store"]
+        guild_data = await self.bot.database.get_guild(guild.id, categories=categories)
+        
+        if guild_data is None:
+            return
+        
+        for role_id, team in guild_data.teams.items():
+            if not guild.get_role(int(role_id)) or not (team.emoji and guild.get_emoji(int(team.emoji))):
+                del guild_data.teams[role_id]
+        
+        for role_id in list(guild_data.coaches.keys()):
+            if not guild.get_role(int(role_id)):
+                del guild_data.coaches[role_id]
+        
+        for name, role_id in guild_data.roles.items():
+            if not guild.get_role(int(role_id)):
+                del guild_data.roles[name]
+        
+        for event, channel_id in guild_data.channels.items():
+            if not guild.get_channel(int(channel_id)):
+                del guild_data.channels[event]
+        
+        # the notice webhooks of channels that are gone
+        for key in list(guild_data.store.keys()):
+            if key.endswith("_webhook") and guild_data.store[key] and not guild_data.channels[key.removesuffix("_webhook")]:
+                guild_data.store[key] = None
+        
+        if (changed := [x for x in categories if guild_data[x].dirty]):
+            await self.bot.database.update_guild(guild_data, *changed)
+            logger.info(f"Pruned deleted roles, emojis & channels from {', '.join(changed)} in guild, {guild.id}")
+    
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        self.debouncer.schedule(role.guild)
+    
+    @commands.Cog.listener()
+    async def on_guild_emojis_update(self, guild: discord.Guild, before: list, after: list):
+        if {x.id for x in before} - {x.id for x in after}:
+            self.debouncer.schedule(guild)
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        self.debouncer.schedule(channel.guild)
+    
+    # commands that come across data that's gone ask for a prune instead of writing it themselves
+    @commands.Cog.listener(name="on_prune")
+    async def prune_requested(self, guild: discord.Guild):
+        self.debouncer.schedule(guild)
+
+async def setup(bot: Peerless):
+    await bot.add_cog(Prune(bot))
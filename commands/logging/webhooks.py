@@ -0,0 +1,28 @@
+from os import environ as env
+
+import colorlog
+import discord
+from discord.ext import commands
+
+from resources.peerless import Peerless
+from resources.utils import Debouncer
+
+logger = colorlog.getLogger('peerless')
+PROVISION_DELAY = float(env.get('PROVISION_DELAY', 5)) # seconds to wait for more notice channels before making their webhooks
+
+class Webhooks(commands.Cog):
+    def __init__(self, bot: Peerless):
+        self.bot: Peerless = bot
+        
+        # notice channels that are set together get their webhooks in one batch
+        self.debouncer = Debouncer(PROVISION_DELAY, self.bot.notices.provision, "provision notice webhooks")
+    
+    async def cog_unload(self):
+        self.debouncer.cancel()
+    
+    @commands.Cog.listener(name="on_provision_notices")
+    async def provision_requested(self, guild: discord.Guild):
+        self.debouncer.schedule(guild)
+
+async def setup(bot: Peerless):
+    await bot.add_cog(Webhooks(bot))
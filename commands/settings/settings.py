@@ -154,10 +154,9 @@ class MentionableTwo(BaseView):
                 else: # is a team role
                     emoji = interaction.guild.get_emoji(int(used_data['emoji']))
                     
-                    # if the emoji isn't found on discord, remove it from the database and keep going
+                    # if the emoji isn't found on discord, the team is pruned in the background so keep going
                     if not emoji:
-                        guild_data.remove_unused_role(mentionable.id)
-                        await interaction.client.database.update_guild(guild_data, "teams")
+                        interaction.client.dispatch("prune", interaction.guild)
                     else:
                         return await interaction.response.send_message(
                             content = f"<:fail:1136341671857102868>**| That role is already connected to the {emoji} {mentionable.mention} team**",
@@ -172,7 +171,7 @@ class MentionableTwo(BaseView):
             
         elif self.category == "channels":
             if guild_data[self.category][self.option.value] == str(mentionable.id):
-                await interaction.response.send_message(
+                return await interaction.response.send_message(
                     content = f"<:fail:1136341671857102868>**| That is already the** `{self.option.label}` **{self.category[:-1]}**",
                     ephemeral = True
                 )
@@ -195,41 +194,6 @@ class MentionableTwo(BaseView):
                         raise NotEnough("teams", "teams add")
                     elif len(guild_data.coaches) == 0:
                         raise NotEnough("coaches", "coaches add")
-                    
-                    team_owners = [(interaction.guild.get_role(int(x)), y) for x, y in guild_data.coaches.items()]
-                    
-                    for team_owner, abbr in team_owners:
-                        if not team_owner:
-                            keys = list(guild_data.coaches.keys())
-                            vals = list(guild_data.coaches.values())
-                            
-                            guild_data.remove_unused_role(keys[vals.index(abbr)])
-                            
-                            if len(guild_data.coaches) == 0:
-                                raise NotEnough("coaches", "coaches add")
-                            
-                    role  = max([x for x in team_owners if x])
-                    teams = sorted([
-                        (
-                            interaction.guild.get_role(int(x)), 
-                            interaction.guild.get_emoji(int(y['emoji']))
-                        ) for x, y in guild_data.teams.items()
-                    ], reverse=True)
-        
-                    item_list = ""
-                    for team, emoji in teams:
-                        if not team or not emoji:
-                            guild_data.remove_unused_role(team.id)
-                            
-                            if len(guild_data.teams) == 0:
-                                raise NotEnough("teams", "teams add")
-                        
-                        owner = [x for x in team.members if x in role.members]
-                        
-                        if owner:
-                            item_list += f"{emoji} | {owner[0].mention} `{owner[0].name}`\n"
-                        else:
-                            team_list += f"{emoji} |\n"
                 else:
                     name = self.option.value.removesuffix("_list")
                     
@@ -240,39 +204,27 @@ class MentionableTwo(BaseView):
                             ephemeral = True,
                         )
                         
-                    role = interaction.guild.get_role(int(guild_data.roles[name]))
-                    
-                    if not role:
-                        await interaction.response.send_message(
-                            content = f"<:fail:1136341671857102868>**| There is no {name} role setup**",
-                            ephemeral = True,
-                        )
-                        
-                        guild_data.remove_unused_role(guild_data.roles[name])
-                        await interaction.client.database.update_guild(guild_data, "roles")
-                        
-                    item_list = ""
-                    for member in role.members:
-                        item_list += f"{member.mention} `{member.name}`"
+                # the list is kept up to date in the background from here on
+                embed = interaction.client.lists.render(interaction.guild, guild_data, self.option.value)
                 
-                embed = discord.Embed(
-                    title = f"{role.name}s",
-                    description = item_list,
-                    color = role.color if role.color.value else Colors.blank,
-                    timestamp = discord.utils.utcnow()
-                )
-                embed.set_footer(text="Last Updated")
+                # the role was deleted, it's pruned in the background
+                if embed is None:
+                    return await interaction.response.send_message(
+                        content = f"<:fail:1136341671857102868>**| There is no {name} role setup**",
+                        ephemeral = True,
+                    )
                 
                 await interaction.response.defer()
                 
                 try:
                     message = await channel.send(embed=embed)
                 except discord.HTTPException:
-                    return await interaction.response.send_message(
+                    return await interaction.followup.send(
                         content = f"<:fail:1136341671857102868>**| I couldn't send the list into {channel.mention}**",
                         ephemeral = True,
                     )
                     
+                interaction.client.lists.sent(interaction.guild.id, self.option.value, embed)
                 guild_data.store[self.option.value + "_message"] = str(message.id)
                     
             mentionable = channel
@@ -294,7 +246,16 @@ class MentionableTwo(BaseView):
         except discord.HTTPException:
             pass
         
-        await interaction.client.database.update_guild(guild_data, self.category)
+        # an auto update list's message is kept in the store
+        await interaction.client.database.update_guild(guild_data, self.category, *(["store"] if guild_data.store.dirty else []))
+        
+        # the member index & the lists that show the role catch up in the background
+        if self.category == "roles":
+            interaction.client.dispatch("league_roles_update", interaction.guild)
+        
+        # the channel's notice webhook is made in the background instead of with the first notice
+        if self.category == "channels":
+            interaction.client.dispatch("provision_notices", interaction.guild)
         
         event = "setting_changes"
         if guild_data.notices[event]:
@@ -328,6 +289,9 @@ class MentionableTwo(BaseView):
         
         await interaction.client.database.update_guild(guild_data, self.category)
         
+        if self.category == "roles":
+            interaction.client.dispatch("league_roles_update", interaction.guild)
+        
         event = "setting_changes"
         if guild_data.notices[event]:
             embed = discord.Embed(
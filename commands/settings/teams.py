@@ -38,16 +38,13 @@ class Teams(commands.GroupCog, name="teams"):
                 interaction.guild.get_emoji(int(y['emoji']))
             ) for x, y in guild_data.teams.items()
         ]
-        teams.sort(reverse=True)
         
-        # check if any the roles or emojis dont exist on discord
-        for role, emoji in teams:
-            if not role or not emoji: # if not found, remove from the database
-                guild_data.remove_unused_role(role.id)
-        
-        # if any of teams were not found, update the database
-        if len(teams) != len(guild_data.teams):
-            await interaction.client.database.update_guild(guild_data, "teams")
+        # teams whose role or emoji was deleted are left out, they're pruned in the background
+        if not all(role and emoji for role, emoji in teams):
+            teams = [(role, emoji) for role, emoji in teams if role and emoji]
+            interaction.client.dispatch("prune", interaction.guild)
+            
+        teams.sort(key=lambda x: x[0], reverse=True)
         
         justification = len(str(len(teams) + 1))
         value = ""
@@ -91,15 +88,12 @@ class Teams(commands.GroupCog, name="teams"):
                     ephemeral = True
                 )
             else: # is a team role
-                emoji = interaction.guild.get_emoji(int(used_data['emoji']))
+                team_emoji = interaction.guild.get_emoji(int(used_data['emoji']))
                 
-                # if the emoji isn't found on discord, remove it from the database and keep going
-                if not emoji:
-                    guild_data.remove_unused_role(role.id)
-                    await interaction.client.database.update_guild(guild_data, "teams")
-                else:
+                # if the emoji isn't found on discord, the team is replaced below so keep going
+                if team_emoji:
                     return await interaction.response.send_message(
-                        content = f"<:fail:1136341671857102868>**| That role is already paired with the {emoji} {role.mention}**",
+                        content = f"<:fail:1136341671857102868>**| That role is already paired with the {team_emoji} {role.mention}**",
                         ephemeral = True
                     )
                     
@@ -126,13 +120,12 @@ class Teams(commands.GroupCog, name="teams"):
             )
         
         # check if the emoji is already paired with a team
-        matched_team = next((int(x) for x, y in guild_data.teams.items() if int(y.emoji) == emoji.id), None)
+        matched_team = guild_data.find_team_by_emoji(emoji.id)
         
         if matched_team:
-            # if the team isn't found on discord, remove it from the database and keep going
-            if not (team := interaction.guild.get_role(matched_team)):
-                guild_data.remove_unused_role(team.id)
-                await interaction.client.database.update_guild(guild_data, "teams")
+            # if the team isn't found on discord, it's pruned in the background so keep going
+            if not (team := interaction.guild.get_role(int(matched_team))):
+                interaction.client.dispatch("prune", interaction.guild)
             else:
                 return await interaction.response.send_message(
                     content = f"<:fail:1136341671857102868>**| That emoji is already paired with the {emoji} {team.mention}**",
@@ -157,6 +150,9 @@ class Teams(commands.GroupCog, name="teams"):
         await interaction.response.send_message(embed=embed)
         await interaction.client.database.update_guild(guild_data, "teams")
         
+        # the member index & the team owner list catch up in the background
+        interaction.client.dispatch("league_roles_update", interaction.guild)
+        
         # send the setting change event
         if guild_data.notices.setting_changes:
             embed = discord.Embed(
@@ -199,6 +195,9 @@ class Teams(commands.GroupCog, name="teams"):
         await interaction.response.send_message(embed=embed)
         await interaction.client.database.update_guild(guild_data, "teams")
         
+        # the member index & the team owner list catch up in the background
+        interaction.client.dispatch("league_roles_update", interaction.guild)
+        
         # send the setting change event
         if guild_data.notices.setting_changes:
             embed = discord.Embed(
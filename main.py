@@ -111,6 +111,7 @@ async def main():
             await bot.close()
             
             if bot.database:
+                await bot.database.flush()
                 await bot.database.close()
                 
             peerless_logger.info("Turned Off!")
@@ -0,0 +1,69 @@
+import json
+from typing import Any, Dict, Optional, Type
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+class Codec:
+    name  : str  = None
+    module: Any  = None
+    
+    @classmethod
+    def available(cls) -> bool:
+        return cls.module is not None
+    
+    def encode(self, value: Any) -> bytes:
+        raise NotImplementedError()
+    
+    def decode(self, value: bytes) -> Any:
+        raise NotImplementedError()
+
+class JSONCodec(Codec):
+    name   = "json"
+    module = json
+    
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode()
+    
+    def decode(self, value: bytes) -> Any:
+        return json.loads(value)
+
+class OrjsonCodec(Codec):
+    name   = "orjson"
+    module = orjson
+    
+    def encode(self, value: Any) -> bytes:
+        return orjson.dumps(value)
+    
+    def decode(self, value: bytes) -> Any:
+        return orjson.loads(value)
+
+class MsgpackCodec(Codec):
+    name   = "msgpack"
+    module = msgpack
+    
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+    
+    def decode(self, value: bytes) -> Any:
+        return msgpack.unpackb(value, raw=False)
+
+# in order of preference when no codec is configured
+CODECS: Dict[str, Type[Codec]] = {codec.name: codec for codec in [OrjsonCodec, MsgpackCodec, JSONCodec]}
+
+def get_codec(name: Optional[str]=None) -> Optional[Codec]:
+    if name is None:
+        return next(codec() for codec in CODECS.values() if codec.available())
+    
+    codec = CODECS.get(name)
+    
+    if codec is None or not codec.available():
+        return
+    return codec()
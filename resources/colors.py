@@ -0,0 +1,49 @@
+import io
+from typing import Tuple
+
+import numpy as np
+from PIL import Image
+
+SAMPLE_SIZE = 64 # icons are downscaled to at most this many pixels a side before they're clustered
+CLUSTERS    = 5
+ITERATIONS  = 8
+
+def pixels(data: bytes) -> np.ndarray:
+    with Image.open(io.BytesIO(data)) as image:
+        image = image.convert("RGBA")
+        image.thumbnail((SAMPLE_SIZE, SAMPLE_SIZE))
+        
+        rgba = np.asarray(image).reshape(-1, 4)
+    
+    # transparent & near white pixels are left out, the same way ColorThief did
+    keep = (rgba[:, 3] >= 125) & ~(rgba[:, :3] > 250).all(axis=1)
+    
+    # an icon that's only transparent or white still has a colour
+    return (rgba[keep] if keep.any() else rgba)[:, :3].astype(np.float32)
+
+def dominant_color(data: bytes) -> Tuple[int, int, int]:
+    rgb = pixels(data)
+    
+    # seeded from the fullest bins of a coarse histogram, so an icon always gives the same colour
+    bins   = (rgb.astype(np.uint16) >> 4) @ np.array([256, 16, 1], dtype=np.uint16)
+    counts = np.bincount(bins, minlength=4096)
+    seeds  = np.argsort(counts)[::-1][:CLUSTERS]
+    seeds  = seeds[counts[seeds] > 0]
+    
+    centroids = np.stack([rgb[bins == seed].mean(axis=0) for seed in seeds])
+    
+    # k-means, the biggest cluster is the dominant colour
+    for _ in range(ITERATIONS):
+        labels = ((rgb[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+        sizes  = np.bincount(labels, minlength=len(centroids))
+        
+        moved = np.stack([
+            rgb[labels == i].mean(axis=0) if sizes[i] else centroids[i] for i in range(len(centroids))
+        ])
+        
+        if np.allclose(moved, centroids, atol=0.5):
+            break
+        
+        centroids = moved
+    
+    return tuple(int(x) for x in centroids[sizes.argmax()].round())
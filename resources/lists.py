@@ -0,0 +1,177 @@
+from os import environ as env
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import colorlog
+import discord
+
+from .exceptions import NotEnough
+from .models import Colors, GuildData
+from .utils import Debouncer
+
+logger = colorlog.getLogger('peerless')
+
+LIST_DELAY = float(env.get('LIST_DELAY', 10)) # seconds to wait for more role changes before a guild's lists are edited
+LISTS      = ("referee_list", "streamer_list", "team_owner_list")
+
+class AutoLists:
+    def __init__(self, bot: discord.Client):
+        self.bot = bot
+        
+        # guild id -> the roles the guild's lists are made from
+        self.roles   : Dict[int, Set[int]] = {}
+        
+        # (guild id, list) -> what the list's message shows
+        self.rendered: Dict[Tuple[int, str], Tuple[str, str, int]] = {}
+        
+        # role changes that come in together are one edit of each list
+        self.debouncer = Debouncer(LIST_DELAY, self.update, "update the auto update lists")
+        
+        self.edits   = 0
+        self.skipped = 0
+    
+    def tracked(self, guild_data: GuildData) -> Set[int]:
+        roles = set()
+        
+        if guild_data.channels.team_owner_list:
+            roles |= {int(x) for x in guild_data.coaches.keys()} | {int(x) for x in guild_data.teams.keys()}
+        
+        for name in ["referee", "streamer"]:
+            if guild_data.channels[f"{name}_list"] and guild_data.roles[name]:
+                roles.add(int(guild_data.roles[name]))
+        
+        return roles
+    
+    def sorted_members(self, guild: discord.Guild, member_ids: Iterable[int]) -> List[discord.Member]:
+        # sorted so the same members always render the same list
+        return sorted([x for x in map(guild.get_member, member_ids) if x], key=lambda x: (x.name, x.id))
+    
+    def render(self, guild: discord.Guild, guild_data: GuildData, name: str) -> Optional[discord.Embed]:
+        if name == "team_owner_list":
+            team_owners = [guild.get_role(int(x)) for x in guild_data.coaches.keys()]
+            teams = [
+                (
+                    guild.get_role(int(x)),
+                    guild.get_emoji(int(y['emoji'])) if y['emoji'] else None
+                ) for x, y in guild_data.teams.items()
+            ]
+            
+            # roles & emojis that were deleted are left out, they're pruned in the background
+            if not all(team_owners) or not all(team and emoji for team, emoji in teams):
+                self.bot.dispatch("prune", guild)
+            
+            team_owners = [x for x in team_owners if x]
+            teams = sorted([(team, emoji) for team, emoji in teams if team and emoji], key=lambda x: x[0], reverse=True)
+            
+            if len(team_owners) == 0:
+                raise NotEnough("coaches", "coaches add")
+            if len(teams) == 0:
+                raise NotEnough("teams", "teams add")
+            
+            role   = max(team_owners)
+            owners = self.bot.member_index.role_members(guild.id, role.id)
+            
+            item_list = ""
+            for team, emoji in teams:
+                if (owner := self.sorted_members(guild, self.bot.member_index.role_members(guild.id, team.id) & owners)):
+                    item_list += f"{emoji} | {owner[0].mention} `{owner[0].name}`\n"
+                else:
+                    item_list += f"{emoji} |\n"
+        else:
+            role_id = guild_data.roles[name.removesuffix("_list")]
+            
+            if not role_id:
+                return
+            
+            # the role was deleted, it's pruned in the background
+            if not (role := guild.get_role(int(role_id))):
+                return self.bot.dispatch("prune", guild)
+            
+            item_list = ""
+            for member in self.sorted_members(guild, self.bot.member_index.role_members(guild.id, role.id)):
+                item_list += f"{member.mention} `{member.name}`\n"
+        
+        embed = discord.Embed(
+            title = f"{role.name}s",
+            description = item_list,
+            color = role.color if role.color.value else Colors.blank,
+            timestamp = discord.utils.utcnow()
+        )
+        embed.set_footer(text="Last Updated")
+        
+        return embed
+    
+    def sent(self, guild_id: int, name: str, embed: discord.Embed):
+        self.rendered[(guild_id, name)] = (embed.title, embed.description, embed.color.value)
+    
+    def roles_changed(self, guild: discord.Guild, role_ids: Set[int]):
+        if (roles := self.roles.get(guild.id)) is None:
+            # the guild's lists haven't been rendered since the bot started
+            return self.schedule(guild)
+        
+        if role_ids & roles:
+            self.schedule(guild)
+    
+    def role_update(self, role: discord.Role):
+        # the name & colour of a list's role are part of the list
+        if role.id in self.roles.get(role.guild.id, ()):
+            self.schedule(role.guild)
+    
+    def forget(self, guild_id: int):
+        self.roles.pop(guild_id, None)
+        
+        for key in [x for x in self.rendered if x[0] == guild_id]:
+            del self.rendered[key]
+    
+    def schedule(self, guild: discord.Guild):
+        self.debouncer.schedule(guild)
+    
+    async def update(self, guild: discord.Guild):
+        if guild.unavailable or self.bot.database is None:
+            return
+        
+        guild_data = await self.bot.database.get_guild(guild.id, categories=["channels", "roles", "teams", "coaches", "store"])
+        
+        if guild_data is None:
+            self.roles[guild.id] = set()
+            return
+        
+        # only changes to these roles edit the lists
+        self.roles[guild.id] = self.tracked(guild_data)
+        
+        for name in LISTS:
+            if not (channel_id := guild_data.channels[name]) or not (message_id := guild_data.store[f"{name}_message"]):
+                continue
+            
+            try:
+                embed = self.render(guild, guild_data, name)
+            except NotEnough:
+                embed = None
+            
+            if embed is None:
+                continue
+            
+            # the timestamp is the only thing that changes when nobody's roles did
+            if self.rendered.get((guild.id, name)) == (embed.title, embed.description, embed.color.value):
+                self.skipped += 1
+                continue
+            
+            if not (channel := guild.get_channel(int(channel_id))):
+                self.bot.dispatch("prune", guild)
+                continue
+            
+            try:
+                await channel.get_partial_message(int(message_id)).edit(embed=embed)
+            except discord.NotFound:
+                # the list was deleted, setting the channel again sends a new one
+                guild_data.store[f"{name}_message"] = None
+                await self.bot.database.update_guild(guild_data, "store")
+                continue
+            except discord.HTTPException as e:
+                logger.error(f"Failed to edit the {name.replace('_', ' ')} in guild, {guild.id}. ({e.text})")
+                continue
+            
+            self.edits += 1
+            self.sent(guild.id, name, embed)
+    
+    def close(self):
+        self.debouncer.cancel()
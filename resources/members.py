@@ -0,0 +1,192 @@
+import asyncio
+import time
+from os import environ as env
+from typing import Dict, Set, Tuple
+
+import colorlog
+import discord
+
+from .models import GuildData
+
+logger = colorlog.getLogger('peerless')
+
+MEMBER_ACTIVE_TTL = float(env.get('MEMBER_ACTIVE_TTL', 30 * 60)) # seconds a member without league roles stays cached after using the bot
+
+# the role settings whose members commands & lists look up, opt-in roles like eligible & pickups ping would pull most of a server back in
+LEAGUE_ROLES = ("operator", "free_agent", "referee", "streamer")
+
+class MemberIndex:
+    def __init__(self, bot: discord.Client):
+        self.bot = bot
+        
+        # guild id -> the roles of the league, its staff roles, teams & coaches
+        self.league : Dict[int, Set[int]] = {}
+        
+        # guild id -> role id -> the members with the role & guild id -> member id -> their league roles
+        self.roles  : Dict[int, Dict[int, Set[int]]] = {}
+        self.members: Dict[int, Dict[int, Set[int]]] = {}
+        
+        # (guild id, member id) -> when the member stops being kept for using the bot
+        self.active : Dict[Tuple[int, int], float] = {}
+        
+        # guild id -> the load that's running
+        self.loads  : Dict[int, asyncio.Task] = {}
+    
+    def loaded(self, guild_id: int) -> bool:
+        return guild_id in self.league
+    
+    def role_members(self, guild_id: int, role_id: int) -> Set[int]:
+        return self.roles.get(guild_id, {}).get(role_id, set())
+    
+    def member_roles(self, guild_id: int, member_id: int) -> Set[int]:
+        return self.members.get(guild_id, {}).get(member_id, set())
+    
+    def league_role_ids(self, guild_data: GuildData) -> Set[int]:
+        roles = {guild_data.roles[x] for x in LEAGUE_ROLES} | set(guild_data.teams.keys()) | set(guild_data.coaches.keys())
+        return {int(x) for x in roles if x}
+    
+    def league_roles(self, member: discord.Member) -> Set[int]:
+        return self.league.get(member.guild.id, set()).intersection(x.id for x in member.roles)
+    
+    def set(self, guild_id: int, member_id: int, roles: Set[int]) -> Set[int]:
+        guild_roles   = self.roles.setdefault(guild_id, {})
+        guild_members = self.members.setdefault(guild_id, {})
+        before        = guild_members.get(member_id, set())
+        
+        for role_id in before - roles:
+            guild_roles[role_id].discard(member_id)
+            
+            if not guild_roles[role_id]:
+                del guild_roles[role_id]
+        
+        for role_id in roles - before:
+            guild_roles.setdefault(role_id, set()).add(member_id)
+        
+        if roles:
+            guild_members[member_id] = roles
+        else:
+            guild_members.pop(member_id, None)
+        
+        # the league roles the member gained or lost
+        return before ^ roles
+    
+    def update(self, member: discord.Member):
+        if not self.loaded(member.guild.id):
+            return
+        
+        if (changed := self.set(member.guild.id, member.id, self.league_roles(member))):
+            self.bot.lists.roles_changed(member.guild, changed)
+    
+    def hook(self, state):
+        parse = state.parsers['GUILD_MEMBER_UPDATE']
+        
+        def parse_guild_member_update(data):
+            guild  = state._get_guild(int(data['guild_id']))
+            cached = guild is not None and guild.get_member(int(data['user']['id'])) is not None
+            
+            parse(data)
+            
+            # only cached members dispatch on_member_update, so a member outside the league gaining a league role is picked up here
+            if guild is None or cached:
+                return
+            
+            member = guild.get_member(int(data['user']['id'])) or discord.Member(data=data, guild=guild, state=state)
+            self.update(member)
+            
+            if self.member_roles(guild.id, member.id) and guild.get_member(member.id) is None:
+                guild._add_member(member)
+        
+        state.parsers['GUILD_MEMBER_UPDATE'] = parse_guild_member_update
+    
+    def remove(self, member: discord.Member):
+        self.active.pop((member.guild.id, member.id), None)
+        
+        if (changed := self.set(member.guild.id, member.id, set())):
+            self.bot.lists.roles_changed(member.guild, changed)
+    
+    def touch(self, member: discord.Member):
+        self.active[(member.guild.id, member.id)] = time.monotonic() + MEMBER_ACTIVE_TTL
+        
+        # members who aren't in the league are only cached while they're using the bot
+        if member.guild.get_member(member.id) is None:
+            member.guild._add_member(member)
+    
+    def forget(self, guild_id: int):
+        for index in [self.league, self.roles, self.members]:
+            index.pop(guild_id, None)
+        
+        for key in [x for x in self.active if x[0] == guild_id]:
+            del self.active[key]
+    
+    async def load(self, guild: discord.Guild):
+        # everything that needs the guild waits on the same load
+        if (task := self.loads.get(guild.id)) is None:
+            task = self.loads[guild.id] = asyncio.create_task(self.index(guild))
+            task.add_done_callback(lambda _: self.loads.pop(guild.id, None))
+        
+        await task
+    
+    async def index(self, guild: discord.Guild):
+        guild_data = await self.bot.database.get_guild(guild.id, categories=["roles", "teams", "coaches"])
+        league     = self.league_role_ids(guild_data) if guild_data else set()
+        before     = self.league.get(guild.id)
+        
+        # roles that were only removed from the league don't need the guild's members again
+        if before is not None and league <= before:
+            self.league[guild.id] = league
+            self.sweep(guild)
+            
+            return self.bot.lists.schedule(guild)
+        
+        # the members come in without being cached, only the ones in the league are kept
+        members = await guild.chunk(cache=False) if league else []
+        
+        self.league[guild.id] = league
+        self.roles[guild.id], self.members[guild.id] = {}, {}
+        
+        for member in members:
+            if (roles := self.league_roles(member)):
+                self.set(guild.id, member.id, roles)
+                guild._add_member(member)
+        
+        self.sweep(guild)
+        
+        # the lists are edited for the league's new roles, the first load leaves them until a role changes
+        if before is not None:
+            self.bot.lists.schedule(guild)
+        
+        logger.info(f"Indexed {len(self.members[guild.id])} league members of {len(members)} members in guild, {guild.id}")
+    
+    def sweep(self, guild: discord.Guild):
+        now = time.monotonic()
+        
+        for member in guild.members:
+            if member.id == self.bot.user.id:
+                continue
+            
+            # members cached by a role change while they weren't in the league show up here
+            roles = self.league_roles(member)
+            
+            if (changed := self.set(guild.id, member.id, roles)):
+                self.bot.lists.roles_changed(guild, changed)
+            
+            if not roles and self.active.get((guild.id, member.id), 0) < now:
+                guild._remove_member(member)
+    
+    def sweep_all(self):
+        now = time.monotonic()
+        
+        for key in [key for key, expires in self.active.items() if expires < now]:
+            del self.active[key]
+        
+        for guild in self.bot.guilds:
+            if self.loaded(guild.id) and guild.id not in self.loads:
+                self.sweep(guild)
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "guilds": len(self.league),
+            "indexed": sum(len(x) for x in self.members.values()),
+            "cached": sum(len(x.members) for x in self.bot.guilds),
+            "active": len(self.active),
+        }
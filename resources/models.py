@@ -1,36 +1,126 @@
 import datetime
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from enum import Enum, _is_dunder
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, ClassVar, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
 
 class BaseData:
+    # empty so the slotted sections don't get a __dict__ from here
+    __slots__ = ()
+    
     def regular(self):
         raise NotImplementedError()
     
+    @property
+    def dirty(self) -> bool:
+        raise NotImplementedError()
+    
+    def collect(self, path: str, sets: Dict[str, Any], unsets: Dict[str, str]):
+        raise NotImplementedError()
+    
+    def mark_clean(self):
+        raise NotImplementedError()
+    
+    @property
+    def version(self) -> int:
+        # bumped by every change to the category, nested values included
+        return self._changes[0]
+    
+    def changed(self):
+        self._changes[0] += 1
+        
+    def adopt(self, child: Any) -> Any:
+        # every container of a category shares one change counter
+        if isinstance(child, BaseData):
+            object.__setattr__(child, "_changes", self._changes)
+        return child
+    
+    def changes(self, path: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        # data that wasn't loaded from the database has nothing to diff against
+        if not self._tracked:
+            return
+        
+        sets, unsets = {}, {}
+        self.collect(path, sets, unsets)
+        
+        update = {}
+        if sets:
+            update["$set"] = sets
+        if unsets:
+            update["$unset"] = unsets
+            
+        return update
+    
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.regular()})"
     
     __str__ = __repr__
+    
+# the only keys whose string values are decoded into datetimes, everything else is left as is
+DATETIME_KEYS = frozenset({
+    "demands_wait_time",
+    "suspended_until",
+    "banned_until",
+})
+    
+def convert(val: Any) -> Any:
+    if isinstance(val, BaseData):
+        return val
+    elif isinstance(val, dict):
+        return DataObject(val)
+    elif isinstance(val, list):
+        return DataArray(val)
+    return val
+
+def regular(val: Any) -> Any:
+    if isinstance(val, BaseData):
+        return val.regular()
+    elif isinstance(val, dict):
+        return {key: regular(x) for key, x in val.items()}
+    elif isinstance(val, list):
+        return [regular(x) for x in val]
+    elif isinstance(val, datetime.datetime):
+        return val.isoformat()
+    return val
 
 class DataObject(BaseData, dict):
     def __init__(self, data: Dict[str, Any]):
         if isinstance(data, DataObject):
             data = data.regular()
-            
-        for key, val in data.items():
-            if isinstance(val, dict):
-                data[key] = DataObject(val)
-            elif isinstance(val, list):
-                data[key] = DataArray(val)
-            elif isinstance(val, str):
-                try:
-                    data[key] = datetime.datetime.fromisoformat(val)
-                except ValueError:
-                    pass
         
+        # nested values stay raw until they're first accessed
         super().__init__(data)
         
+        # keys that were set or deleted since the data was loaded
+        object.__setattr__(self, "_tracked", False)
+        object.__setattr__(self, "_set", set())
+        object.__setattr__(self, "_unset", set())
+        object.__setattr__(self, "_changes", [0])
+        
+    def decode(self, __key: Any, __value: Any) -> Any:
+        if isinstance(__value, BaseData):
+            return __value
+        elif isinstance(__value, dict):
+            __value = DataObject(__value)
+        elif isinstance(__value, list):
+            __value = DataArray(__value)
+        elif isinstance(__value, str) and __key in DATETIME_KEYS:
+            try:
+                __value = datetime.datetime.fromisoformat(__value)
+            except ValueError:
+                return __value
+        else:
+            return __value
+        
+        if self._tracked and isinstance(__value, BaseData):
+            __value.mark_clean()
+        
+        dict.__setitem__(self, __key, self.adopt(__value))
+        return __value
+        
     def __getattr__(self, __key: Any) -> Any:
+        if _is_dunder(__key):
+            raise AttributeError(__key)
+        
         return self.get(__key, None)
     
     def __setattr__(self, __name: str, __value: Any) -> None:
@@ -41,164 +131,174 @@ class DataObject(BaseData, dict):
        
     def __getitem__(self, __key: Any) -> Any:
         try:
-            return super().__getitem__(__key)
+            return self.decode(__key, super().__getitem__(__key))
         except KeyError:
             return
         
-    def has(self, __key) -> bool:
-        return __key in self.keys()
+    def __setitem__(self, __key: Any, __value: Any) -> None:
+        super().__setitem__(__key, self.adopt(convert(__value)))
         
-    def regular(self):
-        return {
-            key: val.regular() if isinstance(val, (DataObject, DataArray))
-            else val.isoformat() if isinstance(val, datetime.datetime)
-            else val for key, val in self.items()
-        }
-    
-class DataArray(BaseData, list):
-    def __init__(self, array: List[Any]):
-        for i in range(len(array)):
-            if isinstance(array[i], dict):
-                array[i] = DataObject(array[i])
-            elif isinstance(array[i], list):
-                array[i] = DataArray(array[i])
-            elif isinstance(array[i], str):
-                try:
-                    array[i] = datetime.datetime.fromisoformat(array[i])
-                except ValueError:
-                    pass
+        self._set.add(__key)
+        self._unset.discard(__key)
+        self.changed()
         
-        super().__init__(array)
+    def __delitem__(self, __key: Any) -> None:
+        super().__delitem__(__key)
         
-    def regular(self):
-        return [
-            x.regular() if isinstance(x, (DataObject, DataArray)) 
-            else x.isoformat() if isinstance(x, datetime.datetime)
-            else x for x in self
-        ]
-    
-def default_object(obj={}):
-    return field(default_factory=lambda: DataObject(obj))
-
-def default_array(arr=[]):
-    return field(default_factory=lambda: DataArray(arr))
-    
-@dataclass
-class GuildData():
-    _id: str
-    
-    settings: Optional[DataObject] = default_object({
-        "roster_cap": "20",
-        "roster_minimum": "10",
-        "mimimum_warning_delay": "2",
-        "demand_type": "amount",
-        "demand_amount": "3",
-        "demand_wait": "7",
-        "waitlist_type": "queue",
-    })
-    channels   : Optional[DataObject] = default_object()
-    roles      : Optional[DataObject] = default_object()
-    store      : Optional[DataObject] = default_object()
+        self._set.discard(__key)
+        self._unset.add(__key)
+        self.changed()
+        
+    def get(self, __key: Any, __default: Any=None) -> Any:
+        if __key in self:
+            return self[__key]
+        return __default
     
-    notices: Optional[DataObject] = default_object({
-        "appoints": True,
-        "notice_changes": True,
-        "player_demand": True,
-        "player_demand_dm": True,
-        "player_leave": True,
-        "player_leave_dm": True,
-        "setting_changes": True,
-        "status_changes": True,
-        "stat_updates": True,
-        "suspensions": True,
-        "team_disband": True,
-        "team_minimum_warning": True,
-        "team_owner_leave": True,
-        "team_swap": True,
-    })
-    status: Optional[DataObject] = default_object({
-        "contracts": True,
-        "demands": True,
-        "demoting": True,
-        "offering": True,
-        "promoting": True,
-        "releasing": True,
-        "scheduling": True,
-        "signing": True,
-        "standings": True,
-        "statistics": True,
-        "waitlist": True,
-    })
+    def values(self) -> List[Any]:
+        return [self.decode(key, val) for key, val in super().items()]
     
-    waitlist   : Optional[DataArray] = default_array()
-    blacklist  : Optional[DataArray] = default_array()
-    statsheets : Optional[DataArray] = default_array([
-        {key: {"url": None, "players": []} for key in ["passer", "runner", "receiver", "corner", "defender", "kicker"]}
-    ])
+    def items(self) -> List[Tuple[Any, Any]]:
+        return [(key, self.decode(key, val)) for key, val in super().items()]
+        
+    def pop(self, __key: Any, *args) -> Any:
+        if __key in self:
+            self._set.discard(__key)
+            self._unset.add(__key)
+            self.changed()
+            
+            return self.decode(__key, super().pop(__key))
+        return super().pop(__key, *args)
     
-    teams      : Optional[DataObject] = default_object() # 0-50
-    coaches    : Optional[DataObject] = default_object() # 0-5
+    def popitem(self) -> Any:
+        key, val = super().popitem()
+        
+        self._set.discard(key)
+        self._unset.add(key)
+        self.changed()
+        
+        return key, val
     
-    season     : Optional[DataArray]  = default_object({"week": "1"})
-    awards     : Optional[DataObject] = default_object()
-    games      : Optional[DataObject] = default_object()
+    def setdefault(self, __key: Any, __default: Any=None) -> Any:
+        if __key not in self:
+            self[__key] = __default
+            
+        return self[__key]
     
-    def __post_init__(self):
-        self.id = int(self._id)
+    def update(self, *args, **kwargs) -> None:
+        for key, val in dict(*args, **kwargs).items():
+            self[key] = val
+            
+    def clear(self) -> None:
+        self._unset.update(self.keys())
+        self._set.clear()
+        self.changed()
         
-    def find_role(self, role_id: int) -> Optional[dict | str]:
-        role_id = str(role_id)
+        super().clear()
         
-        if role_id in self.teams.keys():
-            return self.teams[role_id]
+    def has(self, __key) -> bool:
+        return __key in self.keys()
+        
+    def regular(self):
+        return {key: regular(val) for key, val in super().items()}
         
-        if role_id in self.coaches.keys():
-            return self.coaches[role_id]
+    @property
+    def dirty(self) -> bool:
+        return bool(self._set or self._unset) or any(x.dirty for x in super().values() if isinstance(x, BaseData))
         
-        if role_id in self.roles.values():
-            keys = list(self.roles.keys())
-            vals = list(self.roles.values())
+    def collect(self, path: str, sets: Dict[str, Any], unsets: Dict[str, str]):
+        for key in self._unset:
+            unsets[f"{path}.{key}"] = ""
             
-            return keys[vals.index(role_id)]
+        # values that were never accessed can't have changed
+        for key, val in super().items():
+            if key in self._set:
+                sets[f"{path}.{key}"] = regular(val)
+            elif isinstance(val, BaseData):
+                val.collect(f"{path}.{key}", sets, unsets)
+                
+    def mark_clean(self):
+        object.__setattr__(self, "_tracked", True)
+        self._set.clear()
+        self._unset.clear()
         
-    def remove_unused_role(self, role_id: int):
-        role_id = str(role_id)
+        for val in super().values():
+            if isinstance(val, BaseData):
+                val.mark_clean()
+    
+class DataArray(BaseData, list):
+    def __init__(self, array: List[Any]):
+        # nested values stay raw until they're first accessed
+        super().__init__(array)
         
-        if role_id in self.teams:
-            del self.teams[role_id]
+        self._tracked  = False
+        self._modified = False
+        self._changes  = [0]
         
-        elif role_id in self.coaches:
-            del self.coaches[role_id]
+    def decode(self, index: int, value: Any) -> Any:
+        if isinstance(value, BaseData) or not isinstance(value, (dict, list)):
+            return value
         
-        elif role_id in self.roles:
-            keys = list(self.coaches.keys())
-            vals = list(self.coaches.values())
-            
-            key = keys[vals.index(role_id)]
-            del self.roles[key]
+        value = convert(value)
+        
+        if self._tracked:
+            value.mark_clean()
+        
+        list.__setitem__(self, index, self.adopt(value))
+        return value
+    
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        
+        return self.decode(index, super().__getitem__(index))
+    
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(len(self)):
+            yield self[i]
+        
+    def modify(method):
+        def wrapper(self, *args, **kwargs):
+            self._modified = True
+            self.changed()
             
-    def __getitem__(self, __key):
-        return self.__getattribute__(__key)
+            return method(self, *args, **kwargs)
         
-@dataclass
-class UserData:
-    _id: int
-    guilds: Optional[DataObject] = default_object()
+        return wrapper
     
-    def __post_init__(self):
-        self.id = int(self._id)
+    # arrays are always written whole, any change marks them as modified
+    __setitem__ = modify(list.__setitem__)
+    __delitem__ = modify(list.__delitem__)
+    __iadd__    = modify(list.__iadd__)
+    __imul__    = modify(list.__imul__)
+    append      = modify(list.append)
+    extend      = modify(list.extend)
+    insert      = modify(list.insert)
+    pop         = modify(list.pop)
+    remove      = modify(list.remove)
+    clear       = modify(list.clear)
+    sort        = modify(list.sort)
+    reverse     = modify(list.reverse)
+    
+    del modify
         
-class Colors:
-    red    = 0xFF2323
-    orange = 0xFF924F
-    yellow = 0xFFDA4F
-    green  = 0x7FFF6D
-    blue   = 0x6DA7FF
-    purple = 0xA984FF
-    pink   = 0xFF84FD
-    white  = 0xFFFFFF
-    black  = 0x010101
-    blank  = 0x2B2D31
+    def regular(self):
+        return [regular(x) for x in list.__iter__(self)]
+        
+    @property
+    def dirty(self) -> bool:
+        return self._modified or any(x.dirty for x in list.__iter__(self) if isinstance(x, BaseData))
+        
+    def collect(self, path: str, sets: Dict[str, Any], unsets: Dict[str, str]):
+        if self.dirty:
+            sets[path] = self.regular()
+            
+    def mark_clean(self):
+        self._tracked  = True
+        self._modified = False
+        
+        for val in list.__iter__(self):
+            if isinstance(val, BaseData):
+                val.mark_clean()
     
 class GetItem(type):
     def __getitem__(cls, key: str):
@@ -283,4 +383,335 @@ class SettingCategories(metaclass=GetItem):
         "demand_wait": [(f"{i} day(s)", str(i)) for i in range(1, 15)],
         "mimimum_warning_delay": [(f"{i} day(s)", str(i)) for i in range(1, 6)],
         "waitlist_type": [("ping", "ping"), ("queue", "queue")],
-    }
\ No newline at end of file
+    }
+
+class Section(BaseData):
+    __slots__ = ("_tracked", "_set", "_extra", "_changes")
+    
+    # filled in by section()
+    _fields  : Tuple[str, ...] = ()
+    _keys    : frozenset       = frozenset()
+    _defaults: Dict[str, Any]  = {}
+    
+    def __init__(self, data: Optional[Dict[str, Any]]=None):
+        if isinstance(data, BaseData):
+            data = data.regular()
+            
+        object.__setattr__(self, "_tracked", False)
+        object.__setattr__(self, "_set", set())
+        object.__setattr__(self, "_extra", None)
+        object.__setattr__(self, "_changes", [0])
+        
+        for key in self._fields:
+            object.__setattr__(self, key, self._defaults.get(key))
+            
+        for key, val in (data or {}).items():
+            if key in self._keys:
+                object.__setattr__(self, key, val)
+            else: # keys that aren't settings anymore are kept so they aren't lost when written
+                if self._extra is None:
+                    object.__setattr__(self, "_extra", {})
+                    
+                self._extra[key] = val
+                
+    def __getattr__(self, __key: str) -> Any:
+        if __key.startswith("_"):
+            raise AttributeError(__key)
+        
+        return (self._extra or {}).get(__key)
+    
+    def __setattr__(self, __name: str, __value: Any) -> None:
+        if __name in self._keys:
+            object.__setattr__(self, __name, __value)
+        else:
+            if self._extra is None:
+                object.__setattr__(self, "_extra", {})
+                
+            self._extra[__name] = __value
+            
+        self._set.add(__name)
+        self.changed()
+        
+    def __delattr__(self, __name: str) -> None:
+        setattr(self, __name, None)
+        
+    def __reduce__(self):
+        return self.__class__, (self.regular(),)
+        
+    def __getitem__(self, __key: str) -> Any:
+        return getattr(self, __key)
+    
+    def __setitem__(self, __key: str, __value: Any) -> None:
+        setattr(self, __key, __value)
+        
+    def __delitem__(self, __key: str) -> None:
+        setattr(self, __key, None)
+        
+    def __contains__(self, __key: str) -> bool:
+        return self[__key] is not None
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+    
+    def __len__(self) -> int:
+        return len(self.items())
+        
+    def get(self, __key: str, __default: Any=None) -> Any:
+        val = self[__key]
+        return __default if val is None else val
+    
+    def has(self, __key: str) -> bool:
+        return __key in self
+    
+    # unset settings are None, so only the ones that are set are listed
+    def items(self) -> List[Tuple[str, Any]]:
+        items = [(key, object.__getattribute__(self, key)) for key in self._fields]
+        
+        if self._extra:
+            items += self._extra.items()
+            
+        return [(key, val) for key, val in items if val is not None]
+    
+    def keys(self) -> List[str]:
+        return [key for key, _ in self.items()]
+    
+    def values(self) -> List[Any]:
+        return [val for _, val in self.items()]
+    
+    def regular(self):
+        return {key: regular(val) for key, val in self.items()}
+    
+    @property
+    def dirty(self) -> bool:
+        return bool(self._set)
+    
+    def collect(self, path: str, sets: Dict[str, Any], unsets: Dict[str, str]):
+        for key in self._set:
+            if (val := self[key]) is None:
+                unsets[f"{path}.{key}"] = ""
+            else:
+                sets[f"{path}.{key}"] = regular(val)
+                
+    def mark_clean(self):
+        object.__setattr__(self, "_tracked", True)
+        self._set.clear()
+        
+def section(name: str, options: List[Tuple[str, ...]], defaults: Optional[Dict[str, Any]]=None) -> type:
+    fields = tuple(option[1] for option in options)
+    
+    return type(name, (Section,), {
+        "__slots__": fields,
+        "_fields": fields,
+        "_keys": frozenset(fields),
+        "_defaults": defaults or {},
+    })
+    
+Settings = section("Settings", SettingCategories.settings, {
+    "roster_cap": "20",
+    "roster_minimum": "10",
+    "mimimum_warning_delay": "2",
+    "demand_type": "amount",
+    "demand_amount": "3",
+    "demand_wait": "7",
+    "waitlist_type": "queue",
+})
+Channels = section("Channels", SettingCategories.channels)
+Roles    = section("Roles", SettingCategories.roles)
+Notices  = section("Notices", SettingCategories.notices, {value: True for _, value in SettingCategories.notices})
+Status   = section("Status", SettingCategories.status, {value: True for _, value in SettingCategories.status})
+    
+def default_object(obj={}):
+    return field(default_factory=lambda: DataObject(obj))
+
+def default_array(arr=[]):
+    return field(default_factory=lambda: DataArray(arr))
+    
+@dataclass
+class GuildData():
+    _id: str
+    
+    settings   : Optional[Settings]   = field(default_factory=Settings)
+    channels   : Optional[Channels]   = field(default_factory=Channels)
+    roles      : Optional[Roles]      = field(default_factory=Roles)
+    store      : Optional[DataObject] = default_object()
+    notices    : Optional[Notices]    = field(default_factory=Notices)
+    status     : Optional[Status]     = field(default_factory=Status)
+    
+    waitlist   : Optional[DataArray] = default_array()
+    blacklist  : Optional[DataArray] = default_array()
+    statsheets : Optional[DataArray] = default_array([
+        {key: {"url": None, "players": []} for key in ["passer", "runner", "receiver", "corner", "defender", "kicker"]}
+    ])
+    
+    teams      : Optional[DataObject] = default_object() # 0-50
+    coaches    : Optional[DataObject] = default_object() # 0-5
+    
+    season     : Optional[DataArray]  = default_object({"week": "1"})
+    awards     : Optional[DataObject] = default_object()
+    
+    # categories that weren't loaded & what loads them
+    _unloaded  : Set[str] = field(default_factory=set, repr=False, compare=False)
+    _loader    : Optional[Callable[[List[str]], Awaitable[Dict[str, Any]]]] = field(default=None, repr=False, compare=False)
+    
+    # name -> (the versions of the categories it was built from, index)
+    _indexes   : Dict[str, Tuple[Tuple[int, ...], Dict[str, Any]]] = field(default_factory=dict, repr=False, compare=False)
+    
+    # categories loaded into their own compact types instead of a DataObject
+    sections: ClassVar[Dict[str, type]] = {
+        "settings": Settings,
+        "channels": Channels,
+        "roles": Roles,
+        "notices": Notices,
+        "status": Status,
+    }
+    
+    # categories that grow with every season, only loaded for the commands that ask for them
+    cold: ClassVar[FrozenSet[str]] = frozenset({"waitlist", "blacklist", "statsheets", "awards"})
+    
+    categories: ClassVar[Tuple[str, ...]] = ()
+    hot       : ClassVar[Tuple[str, ...]] = ()
+    
+    def __post_init__(self):
+        self.id = int(self._id)
+        
+        for category in self._unloaded:
+            delattr(self, category)
+            
+    def __getattr__(self, __name: str):
+        if __name in self.__dict__.get("_unloaded", ()):
+            raise AttributeError(f"The {__name} category wasn't loaded, await GuildData.load('{__name}') first")
+        raise AttributeError(f"'GuildData' object has no attribute '{__name}'")
+        
+    def __repr__(self) -> str:
+        # categories that weren't loaded are left out instead of raising
+        loaded = [f"{x.name}={getattr(self, x.name)!r}" for x in fields(self) if x.repr and x.name not in self._unloaded]
+        return f"GuildData({', '.join(loaded)})"
+        
+    async def load(self, *categories: str):
+        missing = [x for x in categories if x in self._unloaded]
+        
+        if not missing:
+            return
+        
+        data = await self._loader(missing)
+        
+        for category in missing:
+            # categories the document doesn't have yet
+            if category not in data:
+                data[category] = self.__dataclass_fields__[category].default_factory()
+                
+            setattr(self, category, data[category])
+            self._unloaded.discard(category)
+        
+    def index(self, name: str, categories: Tuple[str, ...], build: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        # rebuilt only after one of the categories it was built from changes
+        versions = tuple(x for category in categories for x in (id(self[category]), self[category].version))
+        
+        if (cached := self._indexes.get(name)) is None or cached[0] != versions:
+            cached = self._indexes[name] = (versions, build())
+            
+        return cached[1]
+    
+    @property
+    def role_ids(self) -> Dict[str, Tuple[str, str]]:
+        def build():
+            # later categories win, the same order they were looked up in before
+            index = {role_id: ("roles", key) for key, role_id in self.roles.items()}
+            index.update({role_id: ("coaches", role_id) for role_id in self.coaches.keys()})
+            index.update({role_id: ("teams", role_id) for role_id in self.teams.keys()})
+            
+            return index
+        
+        return self.index("role_ids", ("teams", "coaches", "roles"), build)
+    
+    @property
+    def team_emojis(self) -> Dict[str, str]:
+        return self.index("team_emojis", ("teams",), lambda: {
+            str(team.emoji): role_id for role_id, team in self.teams.items() if team.emoji
+        })
+    
+    @property
+    def channel_events(self) -> Dict[str, Tuple[str, ...]]:
+        def build():
+            # events that share a channel share its notice webhook
+            index = {}
+            for event, channel_id in self.channels.items():
+                index[channel_id] = index.get(channel_id, ()) + (event,)
+            
+            return index
+        
+        return self.index("channel_events", ("channels",), build)
+    
+    def find_role(self, role_id: int) -> Optional[dict | str]:
+        if (found := self.role_ids.get(str(role_id))) is None:
+            return
+        
+        category, key = found
+        
+        # roles give the name of the setting, teams & coaches give what's stored for them
+        return key if category == "roles" else self[category][key]
+    
+    def find_team_by_emoji(self, emoji_id: int) -> Optional[str]:
+        return self.team_emojis.get(str(emoji_id))
+        
+    def remove_unused_role(self, role_id: int):
+        if (found := self.role_ids.get(str(role_id))) is None:
+            return
+        
+        category, key = found
+        del self[category][key]
+            
+    def __getitem__(self, __key):
+        return getattr(self, __key)
+        
+GuildData.categories = tuple(x.name for x in fields(GuildData) if not x.name.startswith("_"))
+GuildData.hot        = tuple(x for x in GuildData.categories if x not in GuildData.cold)
+        
+@dataclass
+class UserData:
+    _id: int
+    guilds: Optional[DataObject] = default_object() # legacy, moved into MemberData the first time each one is read
+    
+    def __post_init__(self):
+        self.id = int(self._id)
+        
+@dataclass
+class MemberData:
+    _id: str # guild_id:user_id
+    guild_id  : str = None
+    user_id   : str = None
+    demands   : Optional[DataObject] = default_object({"demands_remaining": "3", "demands_wait_time": None})
+    suspension: Optional[DataObject] = default_object({"suspended_until": None, "banned_until": None})
+    contract  : Optional[DataObject] = default_object({"role_id": None, "terms": None})
+    
+    def __post_init__(self):
+        self.guild_id, self.user_id = self._id.split(':')
+        self.id = int(self.user_id)
+        
+@dataclass
+class GameData:
+    _id: str # guild_id:game_id
+    guild_id: str
+    season  : Optional[str] = None
+    week    : Optional[str] = None
+    home    : Optional[str] = None # team role IDs
+    away    : Optional[str] = None
+    time    : Optional[datetime.datetime] = None
+    score   : Optional[DataArray] = default_array()
+    referee : Optional[str] = None
+    streamer: Optional[str] = None
+    
+    def __post_init__(self):
+        self.id = int(self._id.split(':')[1])
+        
+class Colors:
+    red    = 0xFF2323
+    orange = 0xFF924F
+    yellow = 0xFFDA4F
+    green  = 0x7FFF6D
+    blue   = 0x6DA7FF
+    purple = 0xA984FF
+    pink   = 0xFF84FD
+    white  = 0xFFFFFF
+    black  = 0x010101
+    blank  = 0x2B2D31
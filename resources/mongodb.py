@@ -1,35 +1,490 @@
-from json import dumps, loads
+import asyncio
+import datetime
+import time
+from collections import OrderedDict
+from functools import partial
 from os import environ as env
-from typing import Any, Dict, Optional, Self
+from typing import Any, AsyncIterator, Dict, List, Optional, Self, Set, Tuple
+from uuid import uuid4
 
 import colorlog
 import redis.asyncio as redis
 from discord.utils import utcnow
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument, UpdateOne
 from pymongo.errors import DuplicateKeyError
 
-from .models import DataArray, DataObject, GuildData, UserData
+from .codecs import JSONCodec, get_codec
+from .models import BaseData, DataArray, DataObject, GameData, GuildData, MemberData, UserData
 
 MONGODB_URL = env['MONGODB_URL']
 logger      = colorlog.getLogger("mongodb")
 
+LOCAL_CACHE_ENTRIES  = int(env.get('LOCAL_CACHE_ENTRIES', 5000))
+LOCAL_CACHE_BYTES    = int(env.get('LOCAL_CACHE_BYTES', 64 * 1024 * 1024))
+LOCAL_CACHE_TTL      = float(env.get('LOCAL_CACHE_TTL', 300))
+INVALIDATION_CHANNEL = "peerless:invalidate"
+WRITE_BEHIND_DELAY   = float(env.get('WRITE_BEHIND_DELAY', 0)) # 0 writes straight through
+REDIS_CODEC          = env.get('REDIS_CODEC') # the fastest one installed if not set
+SCHEMA_VERSION       = 3 # bump whenever the shape of cached documents changes, old keys are ignored
+
+SINGLE_FLIGHT_LOCK_MS = int(env.get('SINGLE_FLIGHT_LOCK_MS', 500)) # 0 only coalesces loads within this process
+UNLOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# seconds a cached document lives in redis after it was last read or written, 0 keeps it forever
+REDIS_TTLS = {
+    "guild": int(env.get('REDIS_GUILD_TTL', 7 * 24 * 60 * 60)),
+    "user": int(env.get('REDIS_USER_TTL', 24 * 60 * 60)),
+    "member": int(env.get('REDIS_MEMBER_TTL', 24 * 60 * 60)),
+}
+
+NAMESPACES = list(REDIS_TTLS)
+
+# partial updates of a document that already expired would leave a hash with only some categories
+UPDATE_SCRIPT = """
+if redis.call("exists", KEYS[1]) == 0 then
+    return 0
+end
+redis.call("hset", KEYS[1], unpack(ARGV, 2))
+if tonumber(ARGV[1]) > 0 then
+    redis.call("expire", KEYS[1], ARGV[1])
+end
+return 1
+"""
+
+# what a document is created with, an empty category so no defaults are overwritten
+NEW_DOCUMENTS = {
+    "guild": {"teams": {}},
+    "user": {"guilds": {}},
+}
+
+# namespaces whose documents can be loaded a few categories at a time
+CATEGORIES = {
+    "guild": GuildData.categories,
+}
+
+# fields older documents still have that moved to their own collection, never loaded with the document
+LEGACY_FIELDS = {
+    "guild": {"games": 0},
+}
+
+# the roster queries a league runs, each one scoped to a guild
+MEMBER_INDEXES = [
+    IndexModel([("guild_id", ASCENDING), ("contract.role_id", ASCENDING)]),
+    IndexModel([("guild_id", ASCENDING), ("suspension.suspended_until", ASCENDING)]),
+    IndexModel([("guild_id", ASCENDING), ("suspension.banned_until", ASCENDING)]),
+    IndexModel([("user_id", ASCENDING)]),
+]
+
+# schedules by week & history by time, _id breaks ties between games at the same time
+GAME_INDEXES = [
+    IndexModel([("guild_id", ASCENDING), ("season", ASCENDING), ("week", ASCENDING), ("time", ASCENDING), ("_id", ASCENDING)]),
+    IndexModel([("guild_id", ASCENDING), ("time", ASCENDING), ("_id", ASCENDING)]),
+]
+
+ACTIVITY_KEY       = "peerless:active"
+WARM_CACHE_WINDOW  = float(env.get('WARM_CACHE_WINDOW', 0)) # seconds of guild activity to warm on startup, 0 turns it off
+WARM_CACHE_BATCH   = int(env.get('WARM_CACHE_BATCH', 100))
+ACTIVITY_RETENTION = max(WARM_CACHE_WINDOW, 7 * 24 * 60 * 60)
+
+def clone(data: Any) -> Any:
+    # deep copy of decoded json, so the cached copy can't be changed by whoever holds the other one
+    if isinstance(data, dict):
+        return {key: clone(val) for key, val in data.items()}
+    elif isinstance(data, list):
+        return [clone(x) for x in data]
+    return data
+
+def wrap(data: Dict[str, Any], sections: Optional[Dict[str, type]]=None) -> Dict[str, Any]:
+    sections = sections or {}
+    
+    for key, val in data.items():
+        if isinstance(val, dict):
+            data[key] = sections.get(key, DataObject)(val)
+        elif isinstance(val, list):
+            data[key] = DataArray(val)
+            
+        # loaded categories track their changes so only those get written
+        if isinstance(data[key], BaseData):
+            data[key].mark_clean()
+            
+    return data
+
+def new_member(guild: GuildData, user_id: int, legacy: Optional[Dict[str, Any]]=None) -> Dict[str, Any]:
+    # members still in the legacy UserData.guilds keep what they had
+    legacy = legacy or {}
+    
+    return DataObject({
+        "guild_id": str(guild.id),
+        "user_id" : str(user_id),
+        "demands" : {
+            "demands_remaining": legacy.get("demands_remaining", str(guild.settings.demand_amount or 3)),
+            "demands_wait_time": legacy.get("demands_wait_time", utcnow()),
+        },
+        "suspension": legacy.get("suspension") or {
+            "suspended_until" : None,
+            "banned_until"    : None
+        },
+        "contract": legacy.get("contract") or {
+            "role_id": None,
+            "terms"  : None,
+        }
+    }).regular()
+
+def new_game(guild_id: int, game_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+    time = data.get("time")
+    
+    # stored as a date so games sort & page by time
+    if isinstance(time, str):
+        time = datetime.datetime.fromisoformat(time)
+    
+    # game ids are only unique within a guild
+    return {**data, "guild_id": str(guild_id), "time": time, "_id": f"{guild_id}:{game_id}"}
+
+def load_game(data: Dict[str, Any]) -> GameData:
+    return GameData(**wrap({key: val for key, val in data.items() if key in GameData.__dataclass_fields__}))
+
+class LocalCache:
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.max_bytes   = max_bytes
+        self.ttl         = ttl
+        
+        # key -> [expires_at, data, {category: encoded size}]
+        self.entries: OrderedDict[str, List[Any]] = OrderedDict()
+        self.bytes  = 0
+        self.hits   = 0
+        self.misses = 0
+        
+        # key, "namespace:*" or "*" -> the invalidation it was last dropped by, so loads that raced one don't cache what they read
+        self.generation  = 0
+        self.generations: Dict[str, int] = {}
+        
+        # the generation the counts above were last cleared at
+        self.forgotten = 0
+        
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def get(self, key: str, categories: Optional[List[str]]=None) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(key)
+        
+        if entry is None:
+            self.misses += 1
+            return
+        
+        if entry[0] < time.monotonic():
+            self.pop(key)
+            self.misses += 1
+            return
+        
+        # documents can be cached a few categories at a time
+        if categories and not all(x in entry[2] for x in categories):
+            self.misses += 1
+            return
+        
+        self.entries.move_to_end(key)
+        self.hits += 1
+        
+        # data objects copy nested values when they're first accessed, so a shallow copy is enough
+        return dict(entry[1])
+    
+    def set(self, key: str, data: Dict[str, Any], sizes: Dict[str, int]):
+        self.pop(key)
+        
+        self.entries[key] = [time.monotonic() + self.ttl, data, sizes]
+        self.bytes += sum(sizes.values())
+        
+        self.evict()
+        
+    def merge(self, key: str, data: Dict[str, Any], sizes: Dict[str, int]):
+        entry = self.entries.get(key)
+        
+        if entry is None or entry[0] < time.monotonic():
+            return self.set(key, data, sizes)
+        
+        _, cached, cached_sizes = entry
+        
+        self.bytes += sum(sizes.values()) - sum(cached_sizes.get(x, 0) for x in sizes)
+        cached.update(data)
+        cached_sizes.update(sizes)
+        
+        entry[0] = time.monotonic() + self.ttl
+        self.entries.move_to_end(key)
+        
+        self.evict()
+        
+    def update(self, key: str, category: str, data: Any, size: int):
+        entry = self.entries.get(key)
+        
+        # only documents that are already cached get updated, the next read will load the rest
+        if entry is None:
+            return
+        
+        _, cached, sizes = entry
+        
+        self.bytes += size - sizes.get(category, 0)
+        cached[category] = data
+        sizes[category]  = size
+        
+        entry[0] = time.monotonic() + self.ttl
+        self.entries.move_to_end(key)
+        
+        self.evict()
+        
+    def pop(self, key: str):
+        entry = self.entries.pop(key, None)
+        
+        if entry is not None:
+            self.bytes -= sum(entry[2].values())
+            
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+        
+    def mark(self, key: str):
+        self.generation += 1
+        self.generations[key] = self.generation
+        
+    def invalidated(self, key: str, seen: int) -> bool:
+        # loads that started before an invalidation that was forgotten can't tell which keys it dropped
+        if seen < self.forgotten:
+            return True
+        
+        # whether the key, or a prefix of it like "member:{guild_id}:*", was dropped after the load that saw the given generation started
+        parts    = key.split(':')
+        prefixes = [":".join(parts[:i] + ["*"]) for i in range(len(parts))]
+        
+        return max([self.generations.get(x, 0) for x in [key, *prefixes]]) > seen
+        
+    def forget(self):
+        self.forgotten = self.generation
+        self.generations.clear()
+        
+    def drop(self, key: str):
+        self.mark(key)
+        
+        # a key, every key of a namespace ("guild:*") or everything ("*")
+        if key == "*":
+            self.clear()
+        elif key.endswith(":*"):
+            for cached in [x for x in self.entries if x.startswith(key[:-1])]:
+                self.pop(cached)
+        else:
+            self.pop(key)
+        
+    def evict(self):
+        while self.entries and (len(self.entries) > self.max_entries or self.bytes > self.max_bytes):
+            _, entry = self.entries.popitem(last=False)
+            self.bytes -= sum(entry[2].values())
+            
+    def sweep(self) -> int:
+        now     = time.monotonic()
+        expired = [key for key, entry in self.entries.items() if entry[0] < now]
+        
+        for key in expired:
+            self.pop(key)
+            
+        return len(expired)
+    
+    def namespaces(self) -> Dict[str, Dict[str, int]]:
+        report = {}
+        
+        for key, (_, _, sizes) in self.entries.items():
+            namespace = report.setdefault(key.split(':')[0], {"entries": 0, "bytes": 0})
+            namespace["entries"] += 1
+            namespace["bytes"]   += sum(sizes.values())
+            
+        return report
+            
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+class WriteBehind:
+    def __init__(self, database: "Database", delay: float) -> None:
+        self.database = database
+        self.delay    = delay
+        
+        # key -> {category: (mongo update or None to write it whole, cached data)}
+        self.pending  : Dict[str, Dict[str, Tuple[Any, Any]]] = {}
+        self.queued_at: Dict[str, float] = {}
+        self.tasks    : Dict[str, asyncio.Task] = {}
+        
+        # flushes that are writing, waited on at shutdown instead of cancelled
+        self.flushing : Set[asyncio.Task] = set()
+        
+        self.flushes   = 0
+        self.coalesced = 0
+        self.failures  = 0
+        self.last_lag  = 0.0
+        self.max_lag   = 0.0
+        
+    def queue(self, key: str, category: str, update: Dict[str, Dict[str, Any]], regular: Any):
+        self.database.cache.update(key, category, regular, len(self.database.codec.encode(regular)))
+        
+        if key in self.pending:
+            self.coalesced += 1
+            
+        # a category queued more than once is written whole instead of merging its changes
+        if category in self.pending.get(key, {}):
+            update = None
+        
+        self.pending.setdefault(key, {})[category] = (update, regular)
+        self.queued_at.setdefault(key, time.monotonic())
+        
+        if key not in self.tasks:
+            self.tasks[key] = asyncio.create_task(self.flush_later(key))
+            
+    def overlay(self, key: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        # reads that miss the local cache still see writes that haven't been flushed
+        for category, (_, regular) in self.pending.get(key, {}).items():
+            data[category] = clone(regular)
+            
+        return data
+            
+    async def flush_later(self, key: str):
+        await asyncio.sleep(self.delay)
+        
+        # writes queued from here on get a flush of their own
+        task = self.tasks.pop(key, None)
+        self.flushing.add(task)
+        
+        try:
+            await self.flush(key)
+        finally:
+            self.flushing.discard(task)
+        
+    async def flush(self, key: str, *, retry: bool=True):
+        categories = self.pending.pop(key, None)
+        queued_at  = self.queued_at.pop(key, time.monotonic())
+        
+        if not categories:
+            return
+        
+        update = {}
+        for category, (changes, regular) in categories.items():
+            for operator, paths in (changes or {"$set": {category: regular}}).items():
+                update.setdefault(operator, {}).update(paths)
+        
+        try:
+            await self.database.write(key, update, {category: regular for category, (_, regular) in categories.items()})
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"Failed to flush queued writes for {key}. ({e})")
+            
+            # keep anything that was queued while the flush was running, a category queued again is
+            # written whole with its newer data so the changes that failed aren't lost
+            pending = self.pending.setdefault(key, {})
+            
+            for category, entry in categories.items():
+                pending[category] = (None, pending[category][1]) if category in pending else entry
+                
+            self.queued_at[key] = min(queued_at, self.queued_at.get(key, queued_at))
+            
+            if retry and key not in self.tasks:
+                self.tasks[key] = asyncio.create_task(self.flush_later(key))
+            return
+        
+        self.flushes += 1
+        self.last_lag = time.monotonic() - queued_at
+        self.max_lag  = max(self.max_lag, self.last_lag)
+        
+    async def flush_all(self):
+        for task in self.tasks.values():
+            task.cancel()
+            
+        # writes that already started finish, anything they put back is flushed below
+        await asyncio.gather(*self.flushing, return_exceptions=True)
+        
+        for task in self.tasks.values():
+            task.cancel()
+            
+        self.tasks.clear()
+        await asyncio.gather(*[self.flush(key, retry=False) for key in list(self.pending)])
+        
+        if self.pending:
+            logger.error(f"Couldn't flush queued writes for {len(self.pending)} documents")
+        
+    def stats(self) -> Dict[str, float]:
+        return {
+            "pending": len(self.pending),
+            "oldest": max([time.monotonic() - x for x in self.queued_at.values()], default=0.0),
+            "flushes": self.flushes,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+        }
+
 class Database:
     def __init__(self) -> None:
         self.client   = AsyncIOMotorClient(MONGODB_URL, tz_aware=True)
         self.database = self.client.peerless
         self.guilds   = self.database.guilds
         self.users    = self.database.users
+        self.members  = self.database.members
+        self.games    = self.database.games
         
         self.redis: Optional[redis.Redis] = None
+        self.codec = get_codec(REDIS_CODEC)
+        
+        if self.codec is None:
+            logger.warning(f"The Redis codec, {REDIS_CODEC}, isn't available. Falling back to json")
+            self.codec = JSONCodec()
+        
+        # the schema version & codec of this process's keys, sent with its invalidations
+        self.keyspace = f"v{SCHEMA_VERSION}.{self.codec.name}"
+        
+        # optional, coalesces category updates per document before writing them
+        self.write_behind = WriteBehind(self, WRITE_BEHIND_DELAY) if WRITE_BEHIND_DELAY > 0 else None
+        
+        # in-process cache in front of redis, kept coherent across processes with pub/sub
+        self.cache    = LocalCache(LOCAL_CACHE_ENTRIES, LOCAL_CACHE_BYTES, LOCAL_CACHE_TTL)
+        self.instance = uuid4().hex
+        self.pubsub   = None
+        self.listener: Optional[asyncio.Task] = None
+        
+        # guild id -> last time it was loaded, written to redis in batches for warming the cache on startup
+        self.active: Dict[int, float] = {}
+        self.tasks : List[asyncio.Task] = []
+        
+        # (key, fetch, create, categories) -> the load every concurrent miss waits on
+        self.inflight : Dict[Tuple[str, bool, bool, Optional[Tuple[str, ...]]], asyncio.Future] = {}
+        self.coalesced = 0
+        
+        # guilds whose games have already been moved out of their guild document
+        self.migrated_games: Set[int] = set()
     
     @classmethod
     async def init(cls: Self) -> Self:
         self = cls()
         
+        await self.members.create_indexes(MEMBER_INDEXES)
+        await self.games.create_indexes(GAME_INDEXES)
+        
         try:
             self.redis = redis.Redis()
             await self.redis.ping()
-            await self.redis.flushdb()
+            
+            self.pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            await self.pubsub.subscribe(INVALIDATION_CHANNEL)
+            self.listener = asyncio.create_task(self.listen())
+            
+            self.tasks.append(asyncio.create_task(self.record_activity()))
+            self.tasks.append(asyncio.create_task(self.sweep()))
+            
+            if WARM_CACHE_WINDOW > 0:
+                self.tasks.append(asyncio.create_task(self.warm()))
             
             logger.info("Connected to Redis")
         except redis.ConnectionError:
@@ -37,74 +492,507 @@ class Database:
         
         return self
     
+    async def flush(self):
+        if self.write_behind:
+            await self.write_behind.flush_all()
+    
     async def close(self):
+        if self.listener:
+            self.listener.cancel()
+            
+        for task in self.tasks:
+            task.cancel()
+            
+        if self.redis:
+            await self.flush_activity()
+            
+        if self.pubsub:
+            await self.pubsub.close()
+            
         if self.redis:
             await self.redis.close()
+            
+    async def listen(self):
+        while True:
+            try:
+                async for message in self.pubsub.listen():
+                    # one bad message or failed unlink mustn't stop the invalidations after it
+                    try:
+                        await self.receive(message['data'])
+                    except Exception as e:
+                        logger.error(f"Failed to handle the Redis invalidation, {message.get('data')!r}. ({e})")
+            except asyncio.CancelledError:
+                raise
+            except redis.RedisError as e:
+                # invalidations may have been missed while disconnected, the subscription comes back with the connection
+                self.cache.drop("*")
+                logger.error(f"Lost the Redis invalidation subscription, retrying... ({e})")
+                
+                await asyncio.sleep(1)
+                
+    async def receive(self, data: bytes):
+        sender, key = data.decode().split(':', 1)
+        instance, _, keyspace = sender.partition('.')
+        
+        # this process already updated its own cache
+        if instance == self.instance:
+            return
+        
+        self.cache.drop(key)
+        
+        # a process on another schema version or codec only updated its own keys, so this one's are stale
+        if keyspace != self.keyspace and not key.endswith("*"):
+            await self.redis.unlink(self.redis_key(key))
+            
+    async def invalidate(self, key: str):
+        self.cache.drop(key)
+            
+        if self.redis is not None:
+            await self.redis.publish(INVALIDATION_CHANNEL, self.invalidation(key))
+            
+    async def unlink(self, *patterns: str) -> int:
+        dropped = 0
+        batch   = []
+        
+        # scanning & unlinking in batches never blocks redis the way KEYS & DEL would
+        for pattern in patterns:
+            async for key in self.redis.scan_iter(match=pattern, count=1000):
+                batch.append(key)
+                
+                if len(batch) >= 500:
+                    dropped += await self.redis.unlink(*batch)
+                    batch.clear()
+                    
+        if batch:
+            dropped += await self.redis.unlink(*batch)
+            
+        return dropped
+    
+    async def clear_cache(self, scope: str, target: Optional[str]=None) -> int:
+        match scope:
+            case "guild":
+                # every schema version & codec, the keys from before they were versioned & the guild's members
+                dropped = await self.unlink(f"v[0-9]*:*:guild:{target}", f"guild:{target}", f"v[0-9]*:*:member:{target}:*")
+                
+                await self.invalidate(f"guild:{target}")
+                await self.invalidate(f"member:{target}:*")
+            case "user":
+                dropped = await self.unlink(f"v[0-9]*:*:user:{target}", f"user:{target}")
+                await self.invalidate(f"user:{target}")
+            case "namespace":
+                dropped = await self.unlink(f"v[0-9]*:*:{target}:*", f"{target}:*")
+                await self.invalidate(f"{target}:*")
+            case "everything":
+                # only peerless's own namespaces, other apps may share the redis database
+                patterns = [f"{prefix}{namespace}:*" for prefix in ["v[0-9]*:*:", "lock:v[0-9]*:*:", ""] for namespace in NAMESPACES]
+                dropped  = await self.unlink(*patterns, "peerless:*")
+                await self.invalidate("*")
+            case _:
+                raise ValueError(f"Unknown cache scope, {scope}")
+            
+        logger.info(f"Cleared {dropped} keys from the {scope} cache{f' ({target})' if target else ''}")
+        return dropped
+    
+    def invalidation(self, key: str) -> str:
+        return f"{self.instance}.{self.keyspace}:{key}"
     
-    async def get_redis(self, key: str):
-        base_data = await self.redis.hgetall(key)
+    def redis_key(self, key: str) -> str:
+        # each schema version & codec has its own keyspace, so different formats can coexist without flushing
+        return f"v{SCHEMA_VERSION}:{self.codec.name}:{key}"
+    
+    async def sweep(self):
+        while True:
+            await asyncio.sleep(60)
+            
+            # cold documents drop back to redis even when the local cache isn't full
+            if (swept := self.cache.sweep()):
+                logger.debug(f"Dropped {swept} expired documents from the Local Cache")
+                
+            # loads still running when the counts are cleared just don't cache what they read
+            self.cache.forget()
+                
+    async def cache_report(self) -> Dict[str, Dict[str, int]]:
+        report = {
+            f"local {namespace}": stats for namespace, stats in self.cache.namespaces().items()
+        }
         
-        if base_data:
-            data = {}
-            for key, val in base_data.items():
-                loaded = loads(val.decode())
+        prefix = self.redis_key("")
+        batch  = []
+        
+        async def measure():
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key in batch:
+                    pipe.memory_usage(key)
+                    
+                sizes = await pipe.execute()
+                
+            for key, size in zip(batch, sizes):
+                key = key.decode()
                 
-                if isinstance(loaded, dict):
-                    data[key.decode()] = loaded
+                if key.startswith(prefix):
+                    namespace = f"redis {key[len(prefix):].split(':')[0]}"
+                elif key.startswith("v") and key[1:].split(':')[0].isdigit():
+                    namespace = "redis old versions"
                 else:
-                    data[key.decode()] = val.decode()
+                    namespace = "redis other"
+                    
+                stats = report.setdefault(namespace, {"entries": 0, "bytes": 0})
+                stats["entries"] += 1
+                stats["bytes"]   += size or 0
+                
+            batch.clear()
+        
+        # scanning doesn't block redis the way KEYS would
+        async for key in self.redis.scan_iter(count=1000):
+            batch.append(key)
+            
+            if len(batch) >= 1000:
+                await measure()
+                
+        if batch:
+            await measure()
+                
+        return report
             
-            base_data = data
-        return base_data
+    async def record_activity(self):
+        while True:
+            await asyncio.sleep(60)
+            
+            try:
+                await self.flush_activity()
+            except redis.RedisError as e:
+                logger.error(f"Failed to record guild activity. ({e})")
+            
+    async def flush_activity(self):
+        if not self.active:
+            return
+        
+        active, self.active = self.active, {}
+        
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zadd(ACTIVITY_KEY, {str(guild_id): last_active for guild_id, last_active in active.items()})
+            pipe.zremrangebyscore(ACTIVITY_KEY, 0, time.time() - ACTIVITY_RETENTION)
+            await pipe.execute()
+            
+    async def warm(self):
+        start = time.perf_counter()
+        
+        # most recently active first, no more than the local cache can hold
+        guild_ids = await self.redis.zrevrangebyscore(ACTIVITY_KEY, "+inf", time.time() - WARM_CACHE_WINDOW, start=0, num=self.cache.max_entries)
+        guild_ids = [x.decode() for x in guild_ids]
+        fetched   = 0
+        
+        for i in range(0, len(guild_ids), WARM_CACHE_BATCH):
+            batch   = guild_ids[i:i + WARM_CACHE_BATCH]
+            results = await self.get_redis_many([f"guild:{x}" for x in batch])
+            missing = [x for x, data in zip(batch, results) if not data]
+            
+            if missing:
+                uncached = {f"guild:{data['_id']}": data async for data in self.guilds.find({'_id': {'$in': missing}}, LEGACY_FIELDS["guild"])}
+                fetched += len(uncached)
+                
+                # the data didn't change, so other processes don't need to drop theirs
+                await self.set_redis_many(uncached, publish=False)
+                
+        logger.info(f"Warmed the cache with {len(guild_ids)} Guilds, {fetched} from MongoDB, in {time.perf_counter() - start:.1f}s")
+    
+    def decode_redis(self, key: str, base_data: Dict[bytes, bytes], partial: bool=False, seen: Optional[int]=None) -> Dict[str, Any]:
+        data  = {field.decode(): self.codec.decode(val) for field, val in base_data.items()}
+        sizes = {field.decode(): len(val) for field, val in base_data.items()}
+        
+        # categories the document doesn't have are cached as null
+        present = clone({k: v for k, v in data.items() if v is not None})
         
-    async def set_redis(self, key: str, data: Dict[str, Any]):
-        data.pop('_id', None)
+        # the document was invalidated while it was being read
+        if seen is not None and self.cache.invalidated(key, seen):
+            return data
+        
+        if partial:
+            self.cache.merge(key, present, sizes)
+        else:
+            self.cache.set(key, present, sizes)
+            
+        return data
+    
+    def ttl(self, key: str) -> int:
+        return REDIS_TTLS.get(key.split(':')[0], 0)
+    
+    async def get_redis(self, key: str, categories: Optional[List[str]]=None):
+        return (await self.get_redis_many([key], categories))[0]
+    
+    async def get_redis_many(self, keys: List[str], categories: Optional[List[str]]=None) -> List[Dict[str, Any]]:
+        seen = self.cache.generation
         
-        category, _id = tuple(key.split(':'))
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                if categories:
+                    pipe.hmget(self.redis_key(key), categories)
+                else:
+                    pipe.hgetall(self.redis_key(key))
+                
+                # reading a document keeps it in redis for longer
+                if (ttl := self.ttl(key)):
+                    pipe.expire(self.redis_key(key), ttl)
+                
+            results = await pipe.execute()
+            
+        # drop the replies to the expires
+        if categories:
+            results = [{x.encode(): val for x, val in zip(categories, values) if val is not None} for values in results if isinstance(values, list)]
+        else:
+            results = [x for x in results if isinstance(x, dict)]
+            
+        return [self.decode_redis(key, base_data, bool(categories), seen) if base_data else {} for key, base_data in zip(keys, results)]
+    
+    def cache_locally(self, key: str, data: Dict[str, Any], categories: Optional[List[str]]=None) -> Dict[str, Any]:
+        category, _id = tuple(key.split(':', 1))
         logger.debug(f"Cached new data for {category.title()} ID, {_id}")
         
-        if self.redis is not None:
-            data = {k: dumps(v) if isinstance(v, dict) else v for k, v in DataObject(data).regular().items()} or {'settings': "{}"}
-            await self.redis.hset(key, mapping=data)
+        regular = DataObject(data).regular()
+        
+        # categories the document doesn't have are cached too, so they aren't looked up again
+        for name in categories or CATEGORIES.get(category, []):
+            regular.setdefault(name, None)
             
-    async def update_redis(self, key: str, category: str, data: Dict[str, Any]):
-        data.pop('_id', None)
+        regular = regular or {'settings': {}}
+        mapping = {k: self.codec.encode(v) for k, v in regular.items()}
+        present = {k: v for k, v in regular.items() if v is not None}
+        sizes   = {k: len(v) for k, v in mapping.items()}
         
-        db, _id = tuple(key.split(':'))
-        logger.debug(f"Updated cache data for {db.title()} ID, {_id}")
+        if categories:
+            self.cache.merge(key, present, sizes)
+        else:
+            self.cache.set(key, present, sizes)
+            
+        return mapping
+        
+    async def set_redis(self, key: str, data: Dict[str, Any], categories: Optional[List[str]]=None, *, publish: bool=True, seen: Optional[int]=None):
+        await self.set_redis_many({key: data}, categories, publish=publish, seen=seen)
+        
+    async def set_redis_many(self, items: Dict[str, Dict[str, Any]], categories: Optional[List[str]]=None, *, publish: bool=True, seen: Optional[int]=None):
+        # callers get the same documents back, with or without them being cached
+        for data in items.values():
+            data.pop('_id', None)
+            
+        # documents invalidated since they were read from mongodb would overwrite newer data
+        mappings = {
+            key: self.cache_locally(key, data, categories) for key, data in items.items()
+            if seen is None or not self.cache.invalidated(key, seen)
+        }
+        
+        if self.redis is not None and mappings:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, mapping in mappings.items():
+                    pipe.hset(self.redis_key(key), mapping=mapping)
+                    
+                    if (ttl := self.ttl(key)):
+                        pipe.expire(self.redis_key(key), ttl)
+                    
+                    if publish:
+                        pipe.publish(INVALIDATION_CHANNEL, self.invalidation(key))
+                    
+                await pipe.execute()
+            
+    async def write(self, key: str, update: Dict[str, Dict[str, Any]], categories: Dict[str, Any]):
+        collection, _id = tuple(key.split(':', 1))
+        
+        await self.database[f"{collection}s"].update_one({'_id': _id}, update)
+        
+        # loads that read the document before this write don't cache it
+        self.cache.mark(key)
         
         if self.redis is not None:
-            json_data = dumps(DataObject(data).regular())
-            await self.redis.hset(key, category, json_data)
+            async with self.redis.pipeline(transaction=False) as pipe:
+                fields = [x for category, regular in categories.items() for x in (category, self.codec.encode(regular))]
+                
+                pipe.eval(UPDATE_SCRIPT, 1, self.redis_key(key), self.ttl(key), *fields)
+                pipe.publish(INVALIDATION_CHANNEL, self.invalidation(key))
+                await pipe.execute()
+                
+        logger.debug(f"Updated {', '.join(categories)} for {collection.title()} ID, {_id}")
         
-    async def get_guild(self, guild_id: int, fetch: Optional[bool]=False):
-        guild_data = None
+    async def update(self, key: str, data: Dict[str, BaseData], *, unset: bool=False):
+        update     = {}
+        categories = {}
         
-        if not fetch and self.redis is not None:
-            guild_data = await self.get_redis(f"guild:{guild_id}")
+        for category, category_data in data.items():
+            if unset:
+                changes = {"$set": {category: {}}}
+                regular = {}
+            else:
+                changes = category_data.changes(category)
+                regular = category_data.regular()
+                
+                # nothing changed since the data was loaded
+                if changes == {}:
+                    continue
+                
+                # data that wasn't loaded from the database is written whole
+                if changes is None:
+                    changes = {"$set": {category: regular}}
+                    
+            if self.write_behind:
+                # the queue has the changes now, a failed flush retries them itself
+                if not unset:
+                    category_data.mark_clean()
+                    
+                self.write_behind.queue(key, category, changes, regular)
+                continue
             
-            if len(guild_data) == 0:
-                guild_data = None
+            # every category changed together goes in one write
+            for operator, fields in changes.items():
+                update.setdefault(operator, {}).update(fields)
+                
+            categories[category] = regular
             
-            if guild_data is not None:
-                logger.debug(f"Retreived Guild ID, {guild_id}, from Redis Cache")
+        if not categories:
+            return
+        
+        # a failed write leaves the changes in place, so the next update sends them again
+        versions = {x: data[x].version for x in categories} if not unset else {}
+        await self.write(key, update, categories)
+        
+        for category, regular in categories.items():
+            # changes made while the write was running go out with the next update
+            if not unset and data[category].version == versions[category]:
+                data[category].mark_clean()
                 
-        if fetch or guild_data is None:
-            guild_data = await self.guilds.find_one({'_id': str(guild_id)})
+            self.cache.update(key, category, regular, len(self.codec.encode(regular)))
+        
+    async def load(self, key: str, fetch: bool=False, create: bool=False, categories: Optional[List[str]]=None) -> Optional[Dict[str, Any]]:
+        collection, _id = tuple(key.split(':', 1))
+        
+        if not fetch and (data := self.cache.get(key, categories or CATEGORIES.get(collection))) is not None:
+            logger.debug(f"Retreived {collection.title()} ID, {_id}, from Local Cache")
+            return data
+        
+        # concurrent misses for the same document share one load
+        flight = (key, fetch, create, tuple(categories) if categories else None)
+        future = self.inflight.get(flight)
+        
+        if future is None:
+            future = self.inflight[flight] = asyncio.ensure_future(self.fetch(key, fetch, create, categories))
+            future.add_done_callback(lambda _: self.inflight.pop(flight, None))
+        else:
+            self.coalesced += 1
+        
+        # one caller timing out doesn't cancel the load for everyone else
+        data = await asyncio.shield(future)
+        
+        # every caller wraps its own copy
+        return dict(data) if data is not None else None
+    
+    async def fetch(self, key: str, fetch: bool=False, create: bool=False, categories: Optional[List[str]]=None) -> Optional[Dict[str, Any]]:
+        collection, _id = tuple(key.split(':', 1))
+        lock = None
+        seen = self.cache.generation
+        
+        if not fetch and self.redis is not None:
+            if (data := await self.get_redis(key, categories)):
+                logger.debug(f"Retreived {collection.title()} ID, {_id}, from Redis Cache")
+                return await self.complete(key, data, categories, seen)
+            
+            # another process is already loading it from mongodb
+            if SINGLE_FLIGHT_LOCK_MS > 0 and (lock := await self.lock(key)) is None:
+                if (data := await self.wait_for_redis(key, categories)):
+                    logger.debug(f"Retreived {collection.title()} ID, {_id}, from Redis Cache after waiting")
+                    return await self.complete(key, data, categories, seen)
+        
+        # only the categories that were asked for
+        projection = {x: 1 for x in categories} if categories else LEGACY_FIELDS.get(collection)
+        
+        try:
+            if create:
+                # get or create in a single round trip
+                data = await self.database[f"{collection}s"].find_one_and_update(
+                    {'_id': _id},
+                    {'$setOnInsert': NEW_DOCUMENTS[collection]},
+                    projection = projection,
+                    upsert = True,
+                    return_document = ReturnDocument.AFTER
+                )
+            else:
+                data = await self.database[f"{collection}s"].find_one({'_id': _id}, projection)
             
-            if guild_data is None:
+            if data is None:
                 return
             
-            logger.debug(f"Retreived Guild ID, {guild_id}, from MongoDB")
-            await self.set_redis(f"guild:{guild_id}", guild_data)
+            logger.debug(f"Retreived {collection.title()} ID, {_id}, from MongoDB")
+            
+            # filling the cache from a read changes nothing, so other processes keep their copies
+            await self.set_redis(key, data, categories, publish=False, seen=seen)
+        finally:
+            if lock:
+                await self.unlock(key, lock)
         
-        for key, val in guild_data.items():
-            if isinstance(val, dict):
-                guild_data[key] = DataObject(val)
-            elif isinstance(val, list):
-                guild_data[key] = DataArray(val)
-                
-        return GuildData(_id=str(guild_id), **guild_data)
+        return data
+    
+    async def complete(self, key: str, data: Dict[str, Any], categories: Optional[List[str]]=None, seen: Optional[int]=None) -> Dict[str, Any]:
+        collection, _id = tuple(key.split(':', 1))
+        
+        # hashes are filled a few categories at a time, so some may not be cached yet
+        if (missing := [x for x in categories or CATEGORIES.get(collection, []) if x not in data]):
+            found = await self.database[f"{collection}s"].find_one({'_id': _id}, {x: 1 for x in missing}) or {}
+            found = {x: found.get(x) for x in missing}
+            
+            logger.debug(f"Retreived {', '.join(missing)} for {collection.title()} ID, {_id}, from MongoDB")
+            
+            # nothing changed, so other processes don't need to drop theirs
+            await self.set_redis(key, dict(found), missing, publish=False, seen=seen)
+            data |= found
+        
+        return {k: v for k, v in data.items() if v is not None}
+    
+    async def lock(self, key: str) -> Optional[str]:
+        token = uuid4().hex
+        
+        if await self.redis.set(f"lock:{self.redis_key(key)}", token, nx=True, px=SINGLE_FLIGHT_LOCK_MS):
+            return token
+        
+    async def unlock(self, key: str, token: str):
+        try:
+            await self.redis.eval(UNLOCK_SCRIPT, 1, f"lock:{self.redis_key(key)}", token)
+        except redis.RedisError:
+            pass # the lock expires on its own
+        
+    async def wait_for_redis(self, key: str, categories: Optional[List[str]]=None) -> Optional[Dict[str, Any]]:
+        deadline = time.monotonic() + SINGLE_FLIGHT_LOCK_MS / 1000
+        
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.025)
+            
+            if (data := await self.get_redis(key, categories)):
+                return data
+            
+    async def get_guild(self, guild_id: int, fetch: Optional[bool]=False, *, create: Optional[bool]=False, categories: Optional[List[str]]=None):
+        self.active[int(guild_id)] = time.time()
+        guild_data = await self.load(f"guild:{guild_id}", fetch, create, categories)
+        
+        if guild_data is None:
+            return
+        
+        if self.write_behind:
+            self.write_behind.overlay(f"guild:{guild_id}", guild_data)
+            
+        # documents from before games had their own collection still have them
+        if not categories:
+            return GuildData(_id=str(guild_id), **wrap({x: guild_data[x] for x in GuildData.categories if x in guild_data}, GuildData.sections))
+        
+        # the rest are loaded when they're first needed
+        return GuildData(
+            _id = str(guild_id), 
+            _unloaded = set(GuildData.categories) - set(categories),
+            _loader = partial(self.get_guild_categories, guild_id),
+            **wrap({x: guild_data[x] for x in categories if x in guild_data}, GuildData.sections)
+        )
+        
+    async def get_guild_categories(self, guild_id: int, categories: List[str]) -> Dict[str, Any]:
+        guild_data = await self.load(f"guild:{guild_id}", categories=categories) or {}
+        
+        if self.write_behind:
+            self.write_behind.overlay(f"guild:{guild_id}", guild_data)
+        
+        return wrap({x: guild_data[x] for x in categories if x in guild_data}, GuildData.sections)
         
     async def create_guild(self, guild_id: int):
         try:
@@ -114,47 +1002,73 @@ class Database:
         
         await self.set_redis(f"guild:{guild_id}", {"settings": {}})
         
-    async def update_guild(self, guild_data: GuildData, category: str, *, unset: bool=False):
-        new_data = getattr(guild_data, category).regular()
+    async def update_guild(self, guild_data: GuildData, *categories: str, unset: bool=False):
+        await self.update(f"guild:{guild_data._id}", {x: getattr(guild_data, x) for x in categories}, unset=unset)
+            
+    async def get_user(self, user_id: int, fetch: Optional[bool]=False, *, create: Optional[bool]=False):
+        user_data = await self.load(f"user:{user_id}", fetch, create)
         
-        await self.guilds.update_one(
-            {'_id': guild_data._id},
-            {f"$set": {category: {}}} if unset else {f"$set": {category: new_data}}
-        )
+        if user_data is None:
+            return
         
-        if unset:
-            await self.update_redis(f"guild:{guild_data._id}", category, {})
-        else:
-            await self.update_redis(f"guild:{guild_data._id}", category, new_data)
-            
-    async def get_user(self, user_id: int, fetch: Optional[bool]=False):
-        user_data = None
+        if self.write_behind:
+            self.write_behind.overlay(f"user:{user_id}", user_data)
         
-        if not fetch and self.redis is not None:
-            user_data = await self.get_redis(f"user:{user_id}")
-            
-            if len(user_data) == 0:
-                user_data = None
-            
-            if user_data is not None:
-                logger.debug(f"Retreived User ID, {user_id}, from Redis Cache")
+        return UserData(_id=str(user_id), **wrap(user_data))
+    
+    async def get_or_create_users(self, user_ids: List[int]) -> Dict[int, UserData]:
+        user_ids = list(dict.fromkeys(int(x) for x in user_ids))
+        found    = {}
+        uncached = {}
+        seen     = self.cache.generation
+        
+        # the bulk write below must not race with queued writes for the same users
+        if self.write_behind:
+            await asyncio.gather(*[self.write_behind.flush(f"user:{x}") for x in user_ids if f"user:{x}" in self.write_behind.pending])
+        
+        for user_id in user_ids:
+            if (user_data := self.cache.get(f"user:{user_id}")) is not None:
+                found[user_id] = user_data
+        
+        # one pipeline for every user missing from the local cache
+        missing = [x for x in user_ids if x not in found]
+        
+        if missing and self.redis is not None:
+            for user_id, user_data in zip(missing, await self.get_redis_many([f"user:{x}" for x in missing])):
+                if user_data:
+                    found[user_id] = user_data
+                    
+        # one query for every user missing from redis
+        missing = [str(x) for x in user_ids if x not in found]
+        
+        if missing:
+            async for user_data in self.users.find({'_id': {'$in': missing}}):
+                user_id = int(user_data['_id'])
                 
-        if fetch or user_data is None:
-            user_data = await self.users.find_one({'_id': str(user_id)})
-            
-            if user_data is None:
-                return
-            
-            logger.debug(f"Retreived User ID, {user_id}, from MongoDB")
-            await self.set_redis(f"user:{user_id}", user_data)
+                found[user_id] = user_data
+                uncached[f"user:{user_id}"] = user_data
+                
+        # one bulk write for every user that has to be created
+        created    = [x for x in user_ids if x not in found]
+        operations = [UpdateOne({'_id': str(x)}, {'$setOnInsert': NEW_DOCUMENTS['user']}, upsert=True) for x in created]
         
-        for key, val in user_data.items():
-            if isinstance(val, dict):
-                user_data[key] = DataObject(val)
-            elif isinstance(val, list):
-                user_data[key] = DataArray(val)
+        if operations:
+            result = await self.users.bulk_write(operations, ordered=False)
+            
+            for user_id in created:
+                found[user_id] = uncached[f"user:{user_id}"] = {'guilds': {}}
                 
-        return UserData(_id=str(user_id), **user_data)
+            # users someone else created first keep what they have
+            if (existing := [str(x) for i, x in enumerate(created) if i not in result.upserted_ids]):
+                async for user_data in self.users.find({'_id': {'$in': existing}}):
+                    found[int(user_data['_id'])] = uncached[f"user:{user_data['_id']}"] = user_data
+                    
+        # users invalidated since the reads started aren't cached
+        if uncached:
+            await self.set_redis_many(uncached, publish=False, seen=seen)
+            
+        logger.debug(f"Retreived {len(user_ids)} User IDs, {len(operations)} created")
+        return {user_id: UserData(_id=str(user_id), **wrap(found[user_id])) for user_id in user_ids}
     
     async def create_user(self, user_id: int):
         try:
@@ -164,35 +1078,260 @@ class Database:
         
         await self.set_redis(f"user:{user_id}", {"guilds": {}})
         
-    async def update_user(self, user_data: UserData, category: str, *, unset: bool=False):
-        new_data = getattr(user_data, category).regular()
+    async def update_user(self, user_data: UserData, *categories: str, unset: bool=False):
+        await self.update(f"user:{user_data._id}", {x: getattr(user_data, x) for x in categories}, unset=unset)
+            
+    async def get_member(self, user_id: int, guild: GuildData, fetch: Optional[bool]=False, *, create: Optional[bool]=False):
+        key = f"member:{guild.id}:{user_id}"
+        member_data = await self.load(key, fetch)
         
-        await self.users.update_one(
-            {'_id': user_data._id},
-            {f"$set": {category: {}}} if unset else {f"$set": {category: new_data}}
-        )
+        # new to the guild, or still in the legacy UserData.guilds
+        if member_data is None:
+            member_data = (await self.create_members([user_id], guild, create=create)).get(int(user_id))
+            
+            if member_data is None:
+                return
         
-        if unset:
-            await self.update_redis(f"user:{user_data._id}", category, {})
-        else:
-            await self.update_redis(f"user:{user_data._id}", category, new_data)
-            
-    async def user_guilds_append(self, user: UserData, guild: GuildData):
-        user.guilds[str(guild.id)] = {
-            "demands_remaining": str(guild.settings.demand_amount or 3),
-            "demands_wait_time": utcnow(),
-            "suspension": {
-                "suspended_until" : None,
-                "banned_until"    : None
-            },
-            "contract": {
-                "role_id": None,
-                "terms"  : None,
-            }
+        if self.write_behind:
+            self.write_behind.overlay(key, member_data)
+            
+        return MemberData(_id=f"{guild.id}:{user_id}", **wrap(member_data))
+    
+    async def get_or_create_members(self, user_ids: List[int], guild: GuildData) -> Dict[int, MemberData]:
+        user_ids = list(dict.fromkeys(int(x) for x in user_ids))
+        keys     = {user_id: f"member:{guild.id}:{user_id}" for user_id in user_ids}
+        found    = {}
+        uncached = {}
+        seen     = self.cache.generation
+        
+        for user_id, key in keys.items():
+            if (member_data := self.cache.get(key)) is not None:
+                found[user_id] = member_data
+                
+        # one pipeline for every member missing from the local cache
+        missing = [x for x in user_ids if x not in found]
+        
+        if missing and self.redis is not None:
+            for user_id, member_data in zip(missing, await self.get_redis_many([keys[x] for x in missing])):
+                if member_data:
+                    found[user_id] = member_data
+                    
+        # one query for every member missing from redis
+        missing = [f"{guild.id}:{x}" for x in user_ids if x not in found]
+        
+        if missing:
+            async for member_data in self.members.find({'_id': {'$in': missing}}):
+                user_id = int(member_data['user_id'])
+                
+                found[user_id] = member_data
+                uncached[keys[user_id]] = member_data
+                
+        # members invalidated since the reads started aren't cached
+        if uncached:
+            await self.set_redis_many(uncached, publish=False, seen=seen)
+            
+        # one round of writes for everyone new to the guild
+        if (missing := [x for x in user_ids if x not in found]):
+            found |= await self.create_members(missing, guild)
+            
+        if self.write_behind:
+            for user_id, key in keys.items():
+                self.write_behind.overlay(key, found[user_id])
+            
+        logger.debug(f"Retreived {len(user_ids)} Members of Guild ID, {guild.id}, {len(missing)} created")
+        return {user_id: MemberData(_id=f"{guild.id}:{user_id}", **wrap(found[user_id])) for user_id in user_ids}
+    
+    async def create_members(self, user_ids: List[int], guild: GuildData, *, create: bool=True) -> Dict[int, Dict[str, Any]]:
+        user_ids = [str(x) for x in user_ids]
+        
+        # anyone still in the legacy UserData.guilds is moved over with what they had
+        legacy = {
+            user_data['_id']: user_data['guilds'][str(guild.id)] async for user_data in self.users.find(
+                {'_id': {'$in': user_ids}, f"guilds.{guild.id}": {'$exists': True}},
+                {f"guilds.{guild.id}": 1}
+            )
+        }
+        created = {
+            user_id: new_member(guild, user_id, legacy.get(user_id)) for user_id in user_ids if create or user_id in legacy
         }
         
-        await self.update_user(user, "guilds")
+        if not created:
+            return {}
+        
+        result = await self.members.bulk_write([
+            UpdateOne({'_id': f"{guild.id}:{user_id}"}, {'$setOnInsert': member_data}, upsert=True) 
+            for user_id, member_data in created.items()
+        ], ordered=False)
+        
+        # members someone else created first keep what they have, so theirs are read back instead of the defaults
+        upserted = {user_id for i, user_id in enumerate(created) if i in result.upserted_ids}
+        
+        if (existing := [f"{guild.id}:{x}" for x in created if x not in upserted]):
+            async for member_data in self.members.find({'_id': {'$in': existing}}):
+                created[member_data['user_id']] = member_data
+        
+        # only removed once the member is safely in its own collection
+        if legacy:
+            await self.users.bulk_write([
+                UpdateOne({'_id': user_id}, {'$unset': {f"guilds.{guild.id}": ""}}) for user_id in legacy
+            ], ordered=False)
+            
+            if self.redis is not None:
+                await self.redis.unlink(*[self.redis_key(f"user:{x}") for x in legacy])
+                
+            for user_id in legacy:
+                await self.invalidate(f"user:{user_id}")
+                
+            logger.info(f"Migrated {len(legacy)} Members of Guild ID, {guild.id}, out of their User data")
+            
+        await self.set_redis_many({f"member:{guild.id}:{user_id}": member_data for user_id, member_data in created.items()})
+        return {int(user_id): member_data for user_id, member_data in created.items()}
+    
+    async def update_member(self, member_data: MemberData, *categories: str, unset: bool=False):
+        await self.update(f"member:{member_data._id}", {x: getattr(member_data, x) for x in categories}, unset=unset)
+        
+    async def remove_member(self, member_data: MemberData):
+        key = f"member:{member_data._id}"
+        
+        await self.members.delete_one({'_id': member_data._id})
+        
+        if self.redis is not None:
+            await self.redis.unlink(self.redis_key(key))
+            
+        await self.invalidate(key)
+        
+    async def find_members(self, guild_id: int, query: Dict[str, Any]) -> List[MemberData]:
+        return [
+            MemberData(**wrap(member_data)) 
+            async for member_data in self.members.find({'guild_id': str(guild_id), **query})
+        ]
+        
+    async def contracted_members(self, guild_id: int, role_id: Optional[int]=None) -> List[MemberData]:
+        return await self.find_members(guild_id, {'contract.role_id': str(role_id) if role_id else {'$ne': None}})
+    
+    async def suspended_members(self, guild_id: int) -> List[MemberData]:
+        # stored as iso strings, which compare in the same order as the datetimes
+        now = utcnow().isoformat()
+        
+        return await self.find_members(guild_id, {'$or': [
+            {'suspension.suspended_until': {'$gt': now}},
+            {'suspension.banned_until': {'$gt': now}},
+        ]})
+        
+    async def migrate_games(self, guild_id: int):
+        if int(guild_id) in self.migrated_games:
+            return
+        
+        # leagues with games still in their guild document move them over the first time they're read
+        if (guild_data := await self.guilds.find_one({'_id': str(guild_id), 'games': {'$exists': True}}, {'games': 1})):
+            games = guild_data['games'] or {}
+            
+            if games:
+                result = await self.games.bulk_write([
+                    UpdateOne({'_id': f"{guild_id}:{game_id}"}, {'$setOnInsert': new_game(guild_id, game_id, game)}, upsert=True)
+                    for game_id, game in games.items()
+                ], ordered=False)
+                
+                # games that were already moved by an earlier try match, anything else stays where it is
+                if result.upserted_count + result.matched_count != len(games):
+                    return logger.error(f"Failed to migrate the Games of Guild ID, {guild_id}, {result.upserted_count + result.matched_count} of {len(games)} were written")
+                
+            # only removed once every game is safely in its own collection
+            await self.guilds.update_one({'_id': str(guild_id)}, {'$unset': {'games': ""}})
+            
+            if self.redis is not None:
+                await self.redis.hdel(self.redis_key(f"guild:{guild_id}"), "games")
+                
+            await self.invalidate(f"guild:{guild_id}")
+            logger.info(f"Migrated {len(games)} Games of Guild ID, {guild_id}, out of its Guild data")
+            
+        self.migrated_games.add(int(guild_id))
         
-    async def user_guilds_remove(self, user: UserData, guild: GuildData):
-        del user.guilds[str(guild.id)]
-        await self.update_user(user, "guilds")
\ No newline at end of file
+    async def add_game(self, guild_id: int, game_id: int, **data) -> GameData:
+        game_data = new_game(guild_id, game_id, data)
+        
+        await self.games.insert_one(game_data)
+        return load_game(game_data)
+    
+    async def get_game(self, guild_id: int, game_id: int) -> Optional[GameData]:
+        await self.migrate_games(guild_id)
+        
+        if (game_data := await self.games.find_one({'_id': f"{guild_id}:{game_id}"})):
+            return load_game(game_data)
+        
+    async def update_game(self, game_data: GameData, **changes):
+        if isinstance(changes.get("time"), str):
+            changes["time"] = datetime.datetime.fromisoformat(changes["time"])
+            
+        for key, val in changes.items():
+            setattr(game_data, key, val)
+            
+        await self.games.update_one({'_id': game_data._id}, {'$set': {
+            key: val.regular() if isinstance(val, BaseData) else val for key, val in changes.items()
+        }})
+        
+    async def remove_game(self, game_data: GameData):
+        await self.games.delete_one({'_id': game_data._id})
+        
+    async def page_games(
+        self, 
+        guild_id: int, 
+        *, 
+        season: Optional[str]=None, 
+        week: Optional[str]=None, 
+        after: Optional[Tuple[Optional[datetime.datetime], str]]=None,
+        limit: int=25,
+        newest: bool=False
+    ) -> Tuple[List[GameData], Optional[Tuple[Optional[datetime.datetime], str]]]:
+        await self.migrate_games(guild_id)
+        
+        query = {'guild_id': str(guild_id)}
+        order = DESCENDING if newest else ASCENDING
+        
+        if season is not None:
+            query['season'] = str(season)
+        if week is not None:
+            query['week'] = str(week)
+            
+        # picks up right after the last game of the previous page, no matter how far in
+        if after is not None:
+            time, _id = after
+            compare   = '$lt' if newest else '$gt'
+            
+            # games without a time sort before every other game, so they're first going up & last going down
+            if time is None and newest:
+                query['time'], query['_id'] = None, {compare: _id}
+            elif time is None:
+                query['$or'] = [{'time': {'$ne': None}}, {'time': None, '_id': {compare: _id}}]
+            elif newest:
+                query['$or'] = [{'time': {compare: time}}, {'time': time, '_id': {compare: _id}}, {'time': None}]
+            else:
+                query['$or'] = [{'time': {compare: time}}, {'time': time, '_id': {compare: _id}}]
+            
+        games = [
+            load_game(game_data) async for game_data in self.games.find(query).sort([('time', order), ('_id', order)]).limit(limit)
+        ]
+        
+        # a full page may have more after it
+        cursor = (games[-1].time, games[-1]._id) if len(games) == limit else None
+        return games, cursor
+    
+    async def iter_games(
+        self, 
+        guild_id: int, 
+        *, 
+        season: Optional[str]=None, 
+        week: Optional[str]=None, 
+        newest: bool=False,
+        batch: int=100
+    ) -> AsyncIterator[GameData]:
+        after = None
+        
+        while True:
+            games, after = await self.page_games(guild_id, season=season, week=week, after=after, limit=batch, newest=newest)
+            
+            for game_data in games:
+                yield game_data
+                
+            if after is None:
+                return
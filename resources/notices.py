@@ -0,0 +1,319 @@
+import asyncio
+import time
+from collections import deque
+from os import environ as env
+from typing import Deque, Dict, List, Optional, Tuple
+
+import aiohttp
+import colorlog
+import discord
+
+from .models import GuildData, SettingCategories
+
+logger = colorlog.getLogger('peerless')
+
+NOTICE_QUEUE_SIZE = int(env.get('NOTICE_QUEUE_SIZE', 100)) # notices waiting on one webhook before new ones are dropped
+NOTICE_WINDOW     = float(env.get('NOTICE_WINDOW', 1)) # seconds to wait for more notices to send with the first one
+NOTICE_RETRIES    = int(env.get('NOTICE_RETRIES', 3))
+NOTICE_BACKOFF    = float(env.get('NOTICE_BACKOFF', 1)) # seconds before the first retry, doubled every retry after
+NOTICE_IDLE       = float(env.get('NOTICE_IDLE', 60)) # seconds an empty queue waits before it stops
+NOTICE_EMBEDS     = 10 # the most embeds a webhook message can have
+NOTICE_CHARACTERS = 6000 # the most characters the embeds of a message can have
+
+# the channel events notices are sent to, channels that only have other events don't need a webhook
+NOTICE_EVENTS = frozenset({"notices"} | {value for _, value in SettingCategories.notices})
+
+class NoticeQueue:
+    def __init__(self, guild_id: int, owner: str, webhook: discord.Webhook):
+        self.guild_id = guild_id
+        self.owner    = owner
+        self.webhook  = webhook
+        
+        # (queued at, embed)
+        self.queue: asyncio.Queue[Tuple[float, discord.Embed]] = asyncio.Queue(NOTICE_QUEUE_SIZE)
+        self.task : Optional[asyncio.Task] = None
+        
+        # a notice that didn't fit in the last batch
+        self.carry: Optional[Tuple[float, discord.Embed]] = None
+        
+    async def batch(self) -> Optional[List[Tuple[float, discord.Embed]]]:
+        if (first := self.carry) is None:
+            try:
+                async with asyncio.timeout(NOTICE_IDLE):
+                    first = await self.queue.get()
+            except asyncio.TimeoutError:
+                return
+            
+        self.carry = None
+        batch = [first]
+        size  = len(first[1])
+        
+        # notices sent to the same channel close together go out as one message
+        deadline = asyncio.get_running_loop().time() + NOTICE_WINDOW
+        
+        while len(batch) < NOTICE_EMBEDS:
+            try:
+                async with asyncio.timeout_at(deadline):
+                    item = await self.queue.get()
+            except asyncio.TimeoutError:
+                break
+            
+            if size + len(item[1]) > NOTICE_CHARACTERS:
+                self.carry = item
+                break
+            
+            batch.append(item)
+            size += len(item[1])
+            
+        return batch
+
+class Notices:
+    def __init__(self, bot: discord.Client):
+        self.bot = bot
+        
+        # (guild id, event) -> (the "id:token" it was made from, webhook)
+        self.webhooks: Dict[Tuple[int, str], Tuple[str, discord.Webhook]] = {}
+        
+        # (guild id, the event that owns the webhook) -> notices waiting to be sent through it
+        self.queues: Dict[Tuple[int, str], NoticeQueue] = {}
+        
+        self.delivered = 0
+        self.messages  = 0
+        self.dropped   = 0
+        self.failed    = 0
+        self.latencies: Deque[float] = deque(maxlen=1000)
+        
+        # (the avatar's key, the avatar) every notice webhook is made with
+        self.avatar     : Optional[Tuple[str, bytes]] = None
+        self.avatar_load: Optional[asyncio.Future] = None
+    
+    def webhook(self, guild_id: int, event: str, stored: str) -> discord.Webhook:
+        key = (guild_id, event)
+        
+        # a webhook that was replaced or removed from the store is made again
+        if (cached := self.webhooks.get(key)) is None or cached[0] != stored:
+            webhook_id, token = stored.split(":")
+            cached = self.webhooks[key] = (stored, discord.Webhook.partial(int(webhook_id), token, client=self.bot, bot_token=self.bot.token))
+        
+        return cached[1]
+    
+    def find_webhook(self, guild_data: GuildData, event: str, channel_id: str) -> Optional[Tuple[str, discord.Webhook]]:
+        # the event's own webhook first, then the webhook of any other event in the same channel
+        for evnt in (event,) + guild_data.channel_events.get(channel_id, ()):
+            if (stored := guild_data.store[f"{evnt}_webhook"]):
+                return evnt, self.webhook(guild_data.id, evnt, stored)
+    
+    async def send(self, interaction: discord.Interaction, event: str, embed: discord.Embed):
+        # the guild's data was loaded with the interaction, notices always need the channels & the store
+        if (guild_data := interaction.extras.get("guild_data")) is None:
+            guild_data = await self.bot.database.get_guild(interaction.guild.id, categories=["channels", "store"])
+        
+        if (channel_id := guild_data.channels[event]) is None:
+            return
+        
+        event_channel = interaction.guild.get_channel(int(channel_id))
+        
+        # the channel & its webhook are pruned in the background
+        if not event_channel:
+            return self.bot.dispatch("prune", interaction.guild)
+        
+        if event_channel.type != discord.ChannelType.text:
+            return
+        
+        if (found := self.find_webhook(guild_data, event, channel_id)) is None:
+            if (found := await self.create_webhook(interaction, guild_data, event, event_channel)) is None:
+                return
+            
+        self.enqueue(guild_data.id, *found, embed)
+        
+    def enqueue(self, guild_id: int, owner: str, webhook: discord.Webhook, embed: discord.Embed):
+        if (notice_queue := self.queues.get((guild_id, owner))) is None:
+            notice_queue = self.queues[(guild_id, owner)] = NoticeQueue(guild_id, owner, webhook)
+            notice_queue.task = asyncio.create_task(self.deliver(notice_queue))
+            
+        notice_queue.webhook = webhook
+        
+        try:
+            notice_queue.queue.put_nowait((time.monotonic(), embed))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(f"Dropped a notice in guild, {guild_id}, {NOTICE_QUEUE_SIZE} notices are already waiting on its {owner} webhook")
+            
+    async def deliver(self, notice_queue: NoticeQueue):
+        try:
+            while (batch := await notice_queue.batch()) is not None:
+                try:
+                    await self.send_batch(notice_queue, batch)
+                except Exception as e:
+                    self.failed += len(batch)
+                    logger.error(f"Failed to send {len(batch)} notice(s) in guild, {notice_queue.guild_id}. ({e})")
+        finally:
+            self.queues.pop((notice_queue.guild_id, notice_queue.owner), None)
+            
+    async def send_batch(self, notice_queue: NoticeQueue, batch: List[Tuple[float, discord.Embed]], recreated: bool=False):
+        # webhooks wait out their own rate limits, what's retried here are the requests that still fail
+        for attempt in range(NOTICE_RETRIES + 1):
+            try:
+                await notice_queue.webhook.send(embeds=[embed for _, embed in batch])
+            except discord.NotFound:
+                # the webhook was deleted, the batch goes out once more through a new one
+                if not recreated and await self.recreate_webhook(notice_queue) is not None:
+                    return await self.send_batch(notice_queue, batch, recreated=True)
+                
+                self.dropped += len(batch)
+                return logger.warning(f"Dropped {len(batch)} notice(s) in guild, {notice_queue.guild_id}, its {notice_queue.owner} webhook was deleted")
+            except (discord.HTTPException, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                retry = not isinstance(e, discord.HTTPException) or e.status == 429 or e.status >= 500
+                
+                if retry and attempt < NOTICE_RETRIES:
+                    await asyncio.sleep(NOTICE_BACKOFF * 2 ** attempt)
+                    continue
+                
+                self.failed += len(batch)
+                return logger.error(f"Failed to send {len(batch)} notice(s) in guild, {notice_queue.guild_id}. ({getattr(e, 'text', e)})")
+            
+            sent_at = time.monotonic()
+            
+            self.delivered += len(batch)
+            self.messages  += 1
+            self.latencies.extend(sent_at - queued_at for queued_at, _ in batch)
+            return
+        
+    async def recreate_webhook(self, notice_queue: NoticeQueue) -> Optional[discord.Webhook]:
+        key = (notice_queue.guild_id, notice_queue.owner)
+        self.webhooks.pop(key, None)
+        
+        stored     = f"{notice_queue.webhook.id}:{notice_queue.webhook.token}"
+        guild_data = await self.bot.database.get_guild(notice_queue.guild_id, categories=["channels", "store"])
+        
+        if guild_data is None:
+            return
+        
+        # another notice already replaced it
+        if (current := guild_data.store[f"{notice_queue.owner}_webhook"]) and current != stored:
+            notice_queue.webhook = self.webhook(*key, current)
+            return notice_queue.webhook
+        
+        guild_data.store[f"{notice_queue.owner}_webhook"] = None
+        
+        try:
+            guild   = self.bot.get_guild(notice_queue.guild_id)
+            channel = guild.get_channel(int(channel_id)) if guild and (channel_id := guild_data.channels[notice_queue.owner]) else None
+            
+            # without the channel or the permission, the next notice sent from a command asks for it
+            if channel is None or channel.type != discord.ChannelType.text or not channel.permissions_for(guild.me).manage_webhooks:
+                return
+            
+            try:
+                webhook = await channel.create_webhook(name="Peerless Notices", avatar=await self.avatar_bytes(), reason="used for notices")
+            except discord.HTTPException as e:
+                return logger.error(f"Failed to create a notice webhook in guild, {guild.id}. ({e.text})")
+            
+            guild_data.store[f"{notice_queue.owner}_webhook"] = stored = f"{webhook.id}:{webhook.token}"
+            self.webhooks[key] = (stored, webhook)
+            notice_queue.webhook = webhook
+            
+            return webhook
+        finally:
+            await self.bot.database.update_guild(guild_data, "store")
+        
+    def stats(self) -> Dict[str, float]:
+        return {
+            "queues": len(self.queues),
+            "depth": sum(x.queue.qsize() + (x.carry is not None) for x in self.queues.values()),
+            "delivered": self.delivered,
+            "messages": self.messages,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "avg_latency": sum(self.latencies) / len(self.latencies) if self.latencies else 0.0,
+            "max_latency": max(self.latencies, default=0.0),
+        }
+        
+    def close(self):
+        for notice_queue in self.queues.values():
+            notice_queue.task.cancel()
+            
+    async def create_webhook(
+        self,
+        interaction: discord.Interaction,
+        guild_data: GuildData,
+        event: str,
+        event_channel: discord.TextChannel
+    ) -> Optional[Tuple[str, discord.Webhook]]:
+        perms = event_channel.permissions_for(interaction.guild.me)
+        
+        if not perms.manage_webhooks:
+            await interaction.followup.send(content=f"<:fail:1136341671857102868>**| I tried to send a notice, but I don't have the permission,** `manage webhooks`**, for the channel** {event_channel.mention}")
+            return
+        
+        try:
+            webhook = await event_channel.create_webhook(name="Peerless Notices", avatar=await self.avatar_bytes(), reason="used for notices")
+        except discord.HTTPException as e:
+            return logger.error(f"Failed to create a notice webhook in guild, {interaction.guild.id}. ({e.text})")
+        
+        guild_data.store[f"{event}_webhook"] = stored = f"{webhook.id}:{webhook.token}"
+        self.webhooks[(guild_data.id, event)] = (stored, webhook)
+        
+        await self.bot.database.update_guild(guild_data, "store")
+        return event, webhook
+        
+    async def avatar_bytes(self) -> bytes:
+        asset = self.bot.user.display_avatar
+        
+        if self.avatar is not None and self.avatar[0] == asset.key:
+            return self.avatar[1]
+        
+        # every webhook made while the avatar downloads waits on the same download
+        if self.avatar_load is None:
+            self.avatar_load = asyncio.ensure_future(asset.read())
+            self.avatar_load.add_done_callback(lambda _: setattr(self, "avatar_load", None))
+            
+        data = await asyncio.shield(self.avatar_load)
+        self.avatar = (asset.key, data)
+        
+        return data
+    
+    async def provision(self, guild: discord.Guild):
+        guild_data = await self.bot.database.get_guild(guild.id, categories=["channels", "store"])
+        
+        if guild_data is None:
+            return
+        
+        # one webhook per channel, made for the first of its events that notices are sent to
+        missing: List[Tuple[discord.TextChannel, str, Tuple[str, ...]]] = []
+        
+        for channel_id, events in guild_data.channel_events.items():
+            if not (owners := [x for x in events if x in NOTICE_EVENTS]):
+                continue
+            if any(guild_data.store[f"{x}_webhook"] for x in events):
+                continue
+            
+            channel = guild.get_channel(int(channel_id))
+            
+            if channel and channel.type == discord.ChannelType.text and channel.permissions_for(guild.me).manage_webhooks:
+                missing.append((channel, owners[0], events))
+                
+        if not missing:
+            return
+        
+        avatar  = await self.avatar_bytes()
+        results = await asyncio.gather(*[
+            channel.create_webhook(name="Peerless Notices", avatar=avatar, reason="used for notices") for channel, _, _ in missing
+        ], return_exceptions=True)
+        
+        for (channel, event, events), webhook in zip(missing, results):
+            if isinstance(webhook, Exception):
+                logger.error(f"Failed to create a notice webhook in guild, {guild.id}. ({getattr(webhook, 'text', webhook)})")
+                continue
+            
+            guild_data.store[f"{event}_webhook"] = stored = f"{webhook.id}:{webhook.token}"
+            self.webhooks[(guild.id, event)] = (stored, webhook)
+            
+            # notices queued on a webhook of the channel that was deleted
+            for notice_queue in [self.queues.get((guild.id, x)) for x in events]:
+                if notice_queue is not None:
+                    notice_queue.webhook = webhook
+                
+        if guild_data.store.dirty:
+            await self.bot.database.update_guild(guild_data, "store")
+            logger.info(f"Provisioned {len([x for x in results if not isinstance(x, Exception)])} notice webhook(s) in guild, {guild.id}")
@@ -1,14 +1,22 @@
 import asyncio
 import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from os import environ as env
+from typing import Coroutine, Dict, List, Optional
 
 import colorlog
 import discord
-from colorthief import ColorThief
 from discord.app_commands import Command, CommandTree
 from discord.ext import commands
 
-from resources.mongodb import Database
+from resources.colors import dominant_color
+from resources.lists import AutoLists
+from resources.members import MemberIndex
+from resources.models import GuildData
+from resources.mongodb import Database, LocalCache
+from resources.notices import Notices
 
 intents = discord.Intents().none()
 intents.emojis = True
@@ -16,9 +24,19 @@ intents.guilds = True
 intents.guild_messages = True
 intents.members = True
 
+# members are cached by the member index, only the league's members & the ones using the bot are kept
 member_cache_flags = discord.MemberCacheFlags().none()
 member_cache_flags.joined = True
 
+logger = colorlog.getLogger('peerless')
+
+# icons are downscaled before their colour is picked, icons with the same hash always have the same colour
+COLOR_ICON_SIZE = 64
+COLOR_TTL       = int(env.get('COLOR_TTL', 30 * 24 * 60 * 60))
+COLOR_BUDGET    = float(env.get('COLOR_BUDGET', 1)) # seconds before falling back to the default colour
+COLOR_WORKERS   = int(env.get('COLOR_WORKERS', 2))
+COLOR_ENTRIES   = int(env.get('COLOR_ENTRIES', 10000)) # icons whose colour is kept in memory
+
 class Peerless(commands.AutoShardedBot):
     def __init__(self, token: str, testing: bool, fail_to_discord: bool):
         super().__init__(
@@ -28,7 +46,7 @@ class Peerless(commands.AutoShardedBot):
             intents = intents,
             member_cache_flags = member_cache_flags,
             max_messages = None,
-            chunk_guilds_at_startup = True,
+            chunk_guilds_at_startup = False,
         )
         
         self.token = token
@@ -39,13 +57,22 @@ class Peerless(commands.AutoShardedBot):
         self.database = None
         self.chunking_guilds  = []
         self.command_mentions = {}
+        self.notices = Notices(self)
+        self.lists   = AutoLists(self)
+        self.member_index = MemberIndex(self)
+        self.member_index.hook(self._connection)
+        
+        # icon hash -> {"color": colour}, the least recently used are dropped past the limit
+        self.colors = LocalCache(COLOR_ENTRIES, COLOR_ENTRIES * 4, COLOR_TTL)
+        self.color_loads: Dict[str, asyncio.Future] = {}
+        self.color_pool : Optional[ProcessPoolExecutor] = None
         
     async def setup_hook(self) -> None:
-        self.database = await Database.init()
+        self.database   = await Database.init()
+        self.color_pool = ProcessPoolExecutor(max_workers=COLOR_WORKERS)
         
         await self.load_commands()
         
-        logger = colorlog.getLogger('peerless')
         logger.info(f"Logged in - {self.user.name} ({self.application_id})")
         logger.info(f"Loaded {len([x for x in self.tree.walk_commands() if isinstance(x, Command)])} Commands")
         
@@ -85,79 +112,138 @@ class Peerless(commands.AutoShardedBot):
             except commands.ExtensionNotLoaded:
                 pass
             
+    async def close(self):
+        await super().close()
+        
+        self.notices.close()
+        self.lists.close()
+        
+        if self.color_pool:
+            self.color_pool.shutdown(wait=False, cancel_futures=True)
+            
     async def colorify(self, icon: discord.Asset):
         if icon is None:
             return
         
+        if (cached := self.colors.get(icon.key)) is not None:
+            return cached["color"]
+        
+        # every embed waiting on the same icon shares one load
+        if (future := self.color_loads.get(icon.key)) is None:
+            future = self.color_loads[icon.key] = asyncio.ensure_future(self.load_color(icon))
+            future.add_done_callback(lambda _: self.color_loads.pop(icon.key, None))
+        
         try:
-            file  = await icon.to_file()
-            image = ColorThief(file.fp)
+            # the load keeps going after the budget, so the colour is ready for the next embed
+            async with asyncio.timeout(COLOR_BUDGET):
+                return await asyncio.shield(future)
+        except asyncio.TimeoutError:
+            logger.debug(f"Picking the colour of icon, {icon.key}, took too long")
+        except Exception as e:
+            logger.debug(f"Failed to pick the colour of icon, {icon.key}. ({e})")
             
-            return discord.Color.from_rgb(*image.get_color(1))
-        except Exception:
-            return
+    async def load_color(self, icon: discord.Asset) -> discord.Color:
+        key   = f"peerless:color:{icon.key}"
+        redis = self.database.redis if self.database else None
+        
+        if redis is not None and (value := await redis.get(key)) is not None:
+            color = discord.Color(int(value))
+        else:
+            data  = await icon.with_static_format("png").with_size(COLOR_ICON_SIZE).read()
+            color = discord.Color.from_rgb(*await asyncio.get_running_loop().run_in_executor(self.color_pool, dominant_color, data))
+            
+            if redis is not None:
+                await redis.set(key, color.value, ex=COLOR_TTL)
+                
+        self.colors.set(icon.key, {"color": color}, {"color": 4})
+        return color
+            
+async def timed(timings: Dict[str, float], stage: str, coro: Coroutine):
+    start = time.perf_counter()
+    
+    try:
+        return await coro
+    finally:
+        timings[stage] = (time.perf_counter() - start) * 1000
+        
+def format_timings(timings: Dict[str, float]) -> str:
+    return ", ".join(f"{stage}: {ms:.1f}ms" for stage, ms in timings.items()) or "no stages finished"
             
 async def chunk(interaction: discord.Interaction[Peerless]):
-    await interaction.guild.chunk()
-    interaction.client.chunking_guilds.remove(interaction.guild.id)
+    try:
+        await interaction.client.member_index.load(interaction.guild)
+    except Exception as e:
+        logger.error(f"Failed to index the league members of guild, {interaction.guild.id}. ({e})")
+    finally:
+        interaction.client.chunking_guilds.remove(interaction.guild.id)
             
 class PeerlessTree(CommandTree[Peerless]):
     async def get_or_create_user_data(self, user_id: int):
-        user_data = await self.client.database.get_user(user_id)
-
-        if user_data is None:
-            await self.client.database.create_user(user_id)
-            user_data = await self.client.database.get_user(user_id)
-                    
-        return user_data
+        return await self.client.database.get_user(user_id, create=True)
     
-    async def get_or_create_guild_data(self, guild_id: int):
-        guild_data = await self.client.database.get_guild(guild_id)
+    async def get_or_create_guild_data(self, guild_id: int, categories: Optional[List[str]]=None):
+        return await self.client.database.get_guild(guild_id, create=True, categories=categories)
+    
+    async def load_interaction_data(self, interaction: discord.Interaction[Peerless]):
+        timings = interaction.extras['timings'] = {}
+        
+        user_ids = [
+            user_id for user_id, raw_user_data in interaction.data.get("resolved", {}).get("members", {}).items() 
+            if not raw_user_data.get('bot', False) and int(user_id) != interaction.user.id
+        ]
+        
+        # every command gets the hot categories, the rest are loaded with GuildData.load by whatever needs them
+        categories = list(GuildData.hot)
+        
+        # user & guild data load at the same time, the members of the guild wait on the guild
+        async with asyncio.TaskGroup() as group:
+            user_task  = group.create_task(timed(timings, "user", self.get_or_create_user_data(interaction.user.id)))
+            guild_task = group.create_task(timed(timings, "guild", self.get_or_create_guild_data(interaction.guild.id, categories)))
+            
+            async def member():
+                return await timed(timings, "member", interaction.client.database.get_member(interaction.user.id, await guild_task, create=True))
+                    
+            async def members():
+                return await timed(timings, "members", interaction.client.database.get_or_create_members(user_ids, await guild_task))
+            
+            member_task = group.create_task(member())
+            
+            if user_ids:
+                users_task   = group.create_task(timed(timings, "users", interaction.client.database.get_or_create_users(user_ids)))
+                members_task = group.create_task(members())
+                
+        interaction.extras['guild_data']  = guild_task.result()
+        interaction.extras['user_data']   = {interaction.user.id: user_task.result()}
+        interaction.extras['member_data'] = {interaction.user.id: member_task.result()}
         
-        if guild_data is None:
-            await self.client.database.create_guild(guild_id)
-            guild_data = await self.client.database.get_guild(guild_id)
+        if user_ids:
+            interaction.extras['user_data']   |= users_task.result()
+            interaction.extras['member_data'] |= members_task.result()
             
-        return guild_data
+        logger.debug(f"Prepared an interaction in guild, {interaction.guild.id}. ({format_timings(timings)})")
     
     async def interaction_check(self, interaction: discord.Interaction[Peerless]) -> bool:
         if interaction.guild.id in interaction.client.chunking_guilds:
             await interaction.response.send_message(content="<:fail:1136341671857102868>**| This server has not been loaded! Please give me some time to load it.**", ephemeral=True)
             return False
         
-        if not interaction.guild.chunked:
+        if not interaction.client.member_index.loaded(interaction.guild.id):
             interaction.client.chunking_guilds.append(interaction.guild.id)
-            await interaction.client.loop.create_task(chunk(interaction))
+            interaction.client.loop.create_task(chunk(interaction))
             
             await interaction.response.send_message(content="<:fail:1136341671857102868>**| This server has not been loaded! Please give me some time to load it.**", ephemeral=True)
             return False
         
+        interaction.client.member_index.touch(interaction.user)
+        
         try:
             async with asyncio.timeout(2):
-                user_data = await self.get_or_create_user_data(interaction.user.id)
-                
-                if interaction.guild:
-                    guild_data = await self.get_or_create_guild_data(interaction.guild.id)
-                        
-                    if not user_data.guilds.get(str(interaction.guild.id)):
-                        await interaction.client.database.user_guilds_append(user_data, guild_data)
-                        
-                    interaction.extras['guild_data'] = guild_data
-                interaction.extras['user_data'] = {interaction.user.id: user_data}
-                
-                if interaction.data.get("resolved") and interaction.data['resolved'].get("members"):
-                    for user_id, raw_user_data in interaction.data["resolved"]["members"].items():
-                        if raw_user_data.get('bot', False):
-                            continue
-                        
-                        user_data = await self.get_or_create_user_data(user_id)
-                            
-                        if interaction.guild and not user_data.guilds.get(str(interaction.guild.id)):
-                            await interaction.client.database.user_guilds_append(user_data, guild_data)
-                            
-                        interaction.extras['user_data'][int(user_id)] = user_data
-                
+                await self.load_interaction_data(interaction)
+        except ExceptionGroup as group:
+            raise group.exceptions[0]
         except (asyncio.TimeoutError, asyncio.CancelledError):
+            logger.warning(f"Preparing an interaction took too long in guild, {interaction.guild.id}. ({format_timings(interaction.extras['timings'])})")
+            
             if interaction.type in discord.InteractionType.component:
                 await interaction.response.defer(thinking=False)
             elif interaction.type == discord.InteractionType.modal_submit:
@@ -1,5 +1,7 @@
+from __future__ import annotations
+
 import asyncio
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Optional
 from unicodedata import normalize
 
 import colorlog
@@ -7,7 +9,10 @@ import discord
 from discord.interactions import Interaction
 
 from .exceptions import CheckFailure
-from .peerless import Peerless
+
+# only for annotations, the bot's own modules import this one
+if TYPE_CHECKING:
+    from .peerless import Peerless
 
 logger = colorlog.getLogger('peerless')
 
@@ -106,77 +111,40 @@ def operator():
         
     return discord.app_commands.check(pred)
             
-async def send_notice(
-    interaction: discord.Interaction[Peerless], 
-    event: str, 
-    embed: discord.Embed,
-    checked_events: Optional[list]=[]
-):
-    checked_events.append(event)
-    guild_data = await interaction.client.database.get_guild(interaction.guild.id)
-    
-    if guild_data.channels[event] is None:
-        if guild_data.store[event + "_webhook"]:
-            guild_data.store[event + "_webhook"] = None
-            await interaction.client.database.update_guild(guild_data, "store")
-        
-        return
-    
-    event_channel = interaction.guild.get_channel(int(guild_data.channels[event]))
-    
-    if not event_channel or event_channel.type != discord.ChannelType.text:
-        if guild_data.store[event + "_webhook"]:
-            guild_data.store[event + "_webhook"] = None
-            await interaction.client.database.update_guild(guild_data, "store")
+class Debouncer:
+    def __init__(self, delay: float, callback: Callable[[discord.Guild], Awaitable[Any]], action: str):
+        self.delay    = delay
+        self.callback = callback
+        self.action   = action # what failed, for the error log
+        
+        # guild id -> the call waiting on more changes
+        self.tasks: Dict[int, asyncio.Task] = {}
+        
+    def schedule(self, guild: discord.Guild):
+        # changes that come in together are handled with one call
+        if guild.id not in self.tasks:
+            self.tasks[guild.id] = asyncio.create_task(self.run_later(guild))
             
-        guild_data.channels[event] = None
-        return await interaction.client.database.update_guild(guild_data, "channels")
-    
-    webhook = None
-    
-    if guild_data.store[event + "_webhook"]:
-        webhook = discord.Webhook.partial(
-            *guild_data.store[f"{event}_webhook"].split(":"), 
-            client=interaction.client, 
-            bot_token=interaction.client.token
-        )
-        
-    if not webhook:
-        for evnt, channel in guild_data.channels.items():
-            if evnt not in checked_events and str(event_channel.id) == channel:
-                return await send_notice(interaction, evnt, embed, checked_events)
+    async def run_later(self, guild: discord.Guild):
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            # changes from here on need another call
+            self.tasks.pop(guild.id, None)
+            
+        try:
+            await self.callback(guild)
+        except Exception as e:
+            logger.error(f"Failed to {self.action} in guild, {guild.id}. ({e})")
             
-        if len(checked_events) > 1:
-            event = checked_events[0]
+    def cancel(self):
+        for task in self.tasks.values():
+            task.cancel()
             
-        perms = event_channel.permissions_for(interaction.guild.me)
-        
-        if not perms.manage_webhooks:
-            return await interaction.followup.send(content=f"<:fail:1136341671857102868>**| I tried to send a notice, but I don't have the permission,** `manage webhooks`**, for the channel** {event_channel.mention}")
+        self.tasks.clear()
             
-        try:
-            webhook = await event_channel.create_webhook(name="Peerless Notices", avatar=await interaction.client.user.display_avatar.read(), reason="used for notices")
-        except discord.HTTPException as e:
-            return logger.error(f"Failed to create a notice webhook in guild, {interaction.guild.id}. ({e.text})")
-        
-        guild_data.store[f"{event}_webhook"] = f"{webhook.id}:{webhook.token}"
-        await interaction.client.database.update_guild(guild_data, "store")
-        
-    try:
-        await webhook.send(embed=embed)
-    except discord.NotFound:
-        guild_data.store[event + "_webhook"] = None
-        await interaction.client.database.update_guild(guild_data, "store")
-        
-        await send_notice(interaction, event, embed, checked_events)
-    except discord.Forbidden:
-        await interaction.followup.send(
-            content=f"<:fail:1136341671857102868>**| Unexpected error while trying to send a notice**"
-        )
-        
-        logger.error(f"Failed to send a notice in guild, {interaction.guild.id}. ({e.text})")
-    except discord.HTTPException as e:
-        logger.error(f"Failed to send a notice in guild, {interaction.guild.id}. ({e.text})")
+async def send_notice(interaction: discord.Interaction[Peerless], event: str, embed: discord.Embed):
+    await interaction.client.notices.send(interaction, event, embed)
     
 def split_embed_text(embed: discord.Embed, separator: Optional[str]="\n"):
     if len(embed.description) > 2000:
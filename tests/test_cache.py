@@ -0,0 +1,39 @@
+import asyncio
+import os
+
+import pytest
+
+fakeredis       = pytest.importorskip("fakeredis")
+mongomock_motor = pytest.importorskip("mongomock_motor")
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+
+from resources.mongodb import Database
+
+async def load_while_invalidated():
+    database = Database()
+    database.redis = fakeredis.FakeAsyncRedis()
+    
+    users = mongomock_motor.AsyncMongoMockClient().peerless.users
+    await users.insert_one({'_id': "1", 'guilds': {}})
+    
+    find_one = users.find_one
+    
+    async def find_one_then_invalidate(*args, **kwargs):
+        user_data = await find_one(*args, **kwargs)
+        
+        # another process updates the user right after it was read
+        await database.invalidate("user:1")
+        return user_data
+    
+    users.find_one = find_one_then_invalidate
+    database.database = {"users": users}
+    
+    user_data = await database.get_user(1)
+    return user_data, database.cache.get("user:1"), await database.redis.exists(database.redis_key("user:1"))
+
+def test_load_invalidated_while_it_runs_is_returned_but_not_cached():
+    user_data, cached, in_redis = asyncio.run(load_while_invalidated())
+    
+    assert user_data.id == 1
+    assert cached is None
+    assert not in_redis
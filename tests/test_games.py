@@ -0,0 +1,51 @@
+import asyncio
+import datetime
+import os
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+
+from resources.mongodb import Database
+
+GUILD_ID = 1
+
+async def games_in_order(newest: bool):
+    database = Database()
+    database.games = mongomock_motor.AsyncMongoMockClient().peerless.games
+    database.migrated_games.add(GUILD_ID)
+    
+    start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    
+    # games that haven't been scheduled yet have no time
+    for game_id in range(1, 6):
+        await database.add_game(GUILD_ID, game_id)
+    for game_id in range(6, 11):
+        await database.add_game(GUILD_ID, game_id, time=start + datetime.timedelta(days=game_id))
+    
+    return [x async for x in database.iter_games(GUILD_ID, newest=newest, batch=3)]
+
+@pytest.mark.parametrize("newest", [False, True])
+def test_iter_games_pages_past_games_without_a_time(newest):
+    games = asyncio.run(games_in_order(newest))
+    
+    assert sorted(x.id for x in games) == list(range(1, 11))
+    assert [x.time is None for x in games] == [not newest] * 5 + [newest] * 5
+
+async def games_of_two_guilds():
+    database = Database()
+    database.games = mongomock_motor.AsyncMongoMockClient().peerless.games
+    database.migrated_games.update({GUILD_ID, 2})
+    
+    # every league numbers its games from 1
+    await database.add_game(GUILD_ID, 1, week="1")
+    await database.add_game(2, 1, week="5")
+    
+    return await database.get_game(GUILD_ID, 1), await database.get_game(2, 1)
+
+def test_games_with_the_same_id_in_two_guilds_are_kept_apart():
+    game, other = asyncio.run(games_of_two_guilds())
+    
+    assert (game.id, game.week) == (1, "1")
+    assert (other.id, other.week) == (1, "5")